@@ -5,7 +5,15 @@ This module contains framework-agnostic base classes and implementations.
 """
 
 from agent.core.base_agent import BaseAgent
-from agent.core.local_model import LocalModelAgent
 from agent.core.prompts import PromptManager
 
 __all__ = ["BaseAgent", "LocalModelAgent", "PromptManager"]
+
+
+def __getattr__(name):
+    # Lazy re-export: importing LocalModelAgent drags in torch/transformers,
+    # which would otherwise slow down every `import agent` (e.g. CLI --help)
+    if name == "LocalModelAgent":
+        from agent.core.local_model import LocalModelAgent
+        return LocalModelAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
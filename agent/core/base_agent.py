@@ -5,6 +5,8 @@ This module defines the abstract base class that all agents must implement,
 ensuring a consistent interface across different implementations.
 """
 
+import asyncio
+import json
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -27,6 +29,12 @@ class BaseAgent(ABC):
         self.config = config or {}
         self.conversation_history: List[Dict[str, str]] = []
 
+        # Per-entry JSON fragments, appended alongside the history so
+        # trajectory saves concatenate O(1) cached strings per new turn
+        # instead of reserializing the whole history each call
+        self._history_json: List[str] = []
+        self._history_json_src: List[Dict[str, str]] = self.conversation_history
+
     @abstractmethod
     def generate_response(
         self,
@@ -54,6 +62,31 @@ class BaseAgent(ABC):
         """
         pass
 
+    async def agenerate_response(
+        self,
+        observation: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Async counterpart of generate_response.
+
+        The default implementation runs the blocking generate_response on
+        a worker thread, so async drivers can overlap one agent's
+        generation with other awaitables (e.g. another episode's
+        environment step). Subclasses backed by natively-async engines
+        can override this to await the engine directly.
+
+        Args:
+            observation: The current observation/state from the environment
+            context: Optional additional context for generating the response
+
+        Returns:
+            The generated response/action as a string
+        """
+        return await asyncio.to_thread(
+            self.generate_response, observation, context
+        )
+
     def update_history(self, observation: str, response: str) -> None:
         """
         Update the conversation history.
@@ -62,10 +95,32 @@ class BaseAgent(ABC):
             observation: The observation that was processed
             response: The response that was generated
         """
-        self.conversation_history.append({
+        entry = {
             "observation": observation,
             "response": response
-        })
+        }
+        self.conversation_history.append(entry)
+        if self._history_json_src is self.conversation_history:
+            self._history_json.append(json.dumps(entry))
+
+    def history_json_fragments(self) -> List[str]:
+        """
+        Get the history as cached per-entry JSON fragments.
+
+        Entries are serialized once when appended; this resynchronizes
+        the fragment list if the history was rebound or truncated (e.g.
+        by reset) and serializes any entries added out of band.
+
+        Returns:
+            One JSON string per history entry, in order
+        """
+        if (self._history_json_src is not self.conversation_history
+                or len(self._history_json) > len(self.conversation_history)):
+            self._history_json = []
+            self._history_json_src = self.conversation_history
+        for entry in self.conversation_history[len(self._history_json):]:
+            self._history_json.append(json.dumps(entry))
+        return self._history_json
 
     def get_history(self) -> List[Dict[str, str]]:
         """
@@ -0,0 +1,43 @@
+"""
+Config loading helpers shared across the agent package.
+
+PyYAML's pure-Python loader costs tens of milliseconds per file;
+compare_models and the trainers reload the same configs repeatedly.
+Loading goes through the LibYAML-backed CSafeLoader when PyYAML was
+built with it, and parsed configs are cached keyed on (path, mtime) so
+each file is parsed once per process until it changes on disk.
+"""
+
+import functools
+import os
+from typing import Any, Dict
+
+from yaml import load as _yaml_load
+
+try:
+    from yaml import CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeLoader as _Loader
+
+
+@functools.lru_cache(maxsize=None)
+def _load_cached(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a YAML file; mtime keys the cache entry to the file version."""
+    with open(path, 'r') as f:
+        return _yaml_load(f, Loader=_Loader) or {}
+
+
+def load_config(path: str) -> Dict[str, Any]:
+    """
+    Load a YAML config file, cached until the file changes.
+
+    The returned dictionary is shared between callers with the same
+    path; treat it as read-only.
+
+    Args:
+        path: Path to the YAML config file
+
+    Returns:
+        Parsed configuration dictionary
+    """
+    return _load_cached(str(path), os.path.getmtime(path))
@@ -5,13 +5,31 @@ This module provides an implementation of the BaseAgent for local models,
 with support for models like Qwen2.5-Coder that can run locally.
 """
 
+import hashlib
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
 import torch
-from typing import Any, Dict, Optional
-from transformers import AutoModelForCausalLM, AutoTokenizer, pipeline, BitsAndBytesConfig
+from transformers import (
+    AutoModelForCausalLM,
+    AutoTokenizer,
+    BitsAndBytesConfig,
+    DynamicCache,
+    GenerationConfig,
+    StaticCache
+)
 
 from agent.core.base_agent import BaseAgent
+from agent.core.logging_utils import get_logger
 from agent.core.prompts import PromptManager
 
+logger = get_logger("mle_dojo.agent")
+
 
 class LocalModelAgent(BaseAgent):
     """
@@ -40,38 +58,105 @@ class LocalModelAgent(BaseAgent):
         self.model_name = model_name
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
 
+        # Inference engine: "hf" (transformers), "vllm" (in-process paged
+        # attention / continuous batching), or "vllm_http" (shared vLLM
+        # OpenAI-compatible server; no weights loaded in this process, so
+        # K concurrent episodes stay memory-flat on the GPU).
+        # `backend` is accepted as an alias for `engine`.
+        self.engine = self.config.get("engine", self.config.get("backend", "hf"))
+
+        # Optional KV-cache quantization ("quanto" or "hqq" backend): halves
+        # or better the cache bandwidth that dominates long-context decode
+        performance_config = self.config.get("performance", {})
+        self.kv_cache_quant = performance_config.get("kv_cache_quant")
+        self.kv_cache_quant_bits = performance_config.get("kv_cache_quant_bits", 4)
+
         # Model parameters from config
         self.max_new_tokens = self.config.get("max_new_tokens", 512)
         self.temperature = self.config.get("temperature", 0.7)
         self.top_p = self.config.get("top_p", 0.9)
 
-        # Initialize prompt manager
-        self.prompt_manager = PromptManager()
+        # KV cache reused across turns (avoids re-prefilling the full prompt)
+        self.past_kv = None
+        self._last_prompt_ids = None
+
+        # Optional disk-backed cache of the static prefix's KV entries,
+        # keyed by hash of the tokenized prefix; reused across episodes
+        prefix_cache_dir = self.config.get("prefix_cache_dir")
+        self._prefix_cache_dir = Path(prefix_cache_dir) if prefix_cache_dir else None
+        self._prefix_cache_max_entries = self.config.get("prefix_cache_max_entries", 16)
+        self._prefix_saved: set = set()
+        self._last_task_description: Optional[str] = None
+
+        # Optional CPU offload of inactive KV caches (keyed by task): frees
+        # VRAM between episodes without discarding prefill work
+        self._offload_kv = self.config.get("offload_kv", False)
+        self._offloaded_caches: Dict[str, Any] = {}
+
+        # Serializes concurrent generate_async calls on the HF engine
+        self._gen_lock = threading.Lock()
 
         # Load model and tokenizer
         self._load_model()
 
+        # Initialize prompt manager; the tokenizer lets it budget history
+        # by tokens instead of a fixed turn count
+        self.prompt_manager = PromptManager(
+            tokenizer=self.tokenizer,
+            max_history_tokens=self.config.get("max_history_tokens")
+        )
+
     def _load_model(self) -> None:
         """Load the model and tokenizer."""
-        print(f"Loading model {self.model_name} on {self.device}...")
+        logger.info(f"Loading model {self.model_name} on {self.device}...")
 
         self.tokenizer = AutoTokenizer.from_pretrained(
             self.model_name,
             trust_remote_code=True
         )
 
+        if self.engine == "vllm":
+            self._load_vllm()
+            return
+
+        if self.engine == "vllm_http":
+            # Remote server holds the weights; this process only keeps the
+            # endpoint details. Launch the server once, e.g.:
+            #   python -m vllm.entrypoints.openai.api_server \
+            #       --model <model> --max-num-seqs 64
+            self.base_url = self.config.get(
+                "base_url", "http://localhost:8000"
+            ).rstrip("/")
+            self.api_key = self.config.get("api_key")
+            self.model = None
+            logger.info(f"Using vLLM server at {self.base_url}")
+            return
+
         # Load model with device_map for optimal memory management (requires accelerate)
-        dtype = torch.float16 if self.device == "cuda" else torch.float32
+        # Prefer bfloat16 on Ampere+ (avoids FP16 overflow in attention softmax)
+        if self.device == "cuda" and torch.cuda.is_bf16_supported():
+            dtype = torch.bfloat16
+        elif self.device == "cuda":
+            dtype = torch.float16
+        else:
+            dtype = torch.float32
 
-        # Check for quantization settings from config
+        # Check for quantization settings from config. Decode is memory-bound,
+        # so 4-bit NF4 weights (~4 GB for a 7B model vs ~14 GB FP16) are the
+        # default; FP16 is a fallback only.
         performance_config = self.config.get("performance", {})
-        use_4bit = performance_config.get("use_4bit_quantization", False)
+        quant_method = performance_config.get("quant_method", "nf4")
+        use_4bit = performance_config.get("use_4bit_quantization", True)
         use_8bit = performance_config.get("use_8bit_quantization", False)
 
         # Prepare quantization config if needed
         quantization_config = None
-        if use_4bit:
-            print("Using 4-bit quantization")
+        if quant_method in ("awq", "gptq"):
+            # Pre-quantized checkpoints carry their own quantization config;
+            # the AWQ/GPTQ kernels fuse dequant+matmul, so nothing extra to do
+            logger.info(f"Loading pre-quantized checkpoint ({quant_method})")
+        elif use_4bit and quant_method == "nf4":
+            logger.info("Using 4-bit NF4 quantization")
             quantization_config = BitsAndBytesConfig(
                 load_in_4bit=True,
                 bnb_4bit_compute_dtype=dtype,
@@ -79,32 +164,46 @@ class LocalModelAgent(BaseAgent):
                 bnb_4bit_quant_type="nf4"
             )
         elif use_8bit:
-            print("Using 8-bit quantization")
+            logger.info("Using 8-bit quantization")
             quantization_config = BitsAndBytesConfig(
                 load_in_8bit=True
             )
 
+        # Use fused attention kernels: FlashAttention-2 where installed,
+        # falling back to PyTorch SDPA (both cut attention memory traffic)
+        attn_impl = performance_config.get("attn_impl", "flash_attention_2")
+
         # Use device_map="auto" for better performance with accelerate library
         # Falls back to manual device placement if accelerate is not available
-        try:
-            model_kwargs = {
-                "device_map": "auto",
-                "trust_remote_code": True
-            }
-
-            # Add quantization config if specified
-            if quantization_config:
-                model_kwargs["quantization_config"] = quantization_config
-            else:
-                model_kwargs["torch_dtype"] = dtype
+        model_kwargs = {
+            "device_map": "auto",
+            "trust_remote_code": True,
+            "attn_implementation": attn_impl
+        }
+
+        # Add quantization config if specified
+        if quantization_config:
+            model_kwargs["quantization_config"] = quantization_config
+        else:
+            model_kwargs["torch_dtype"] = dtype
 
+        try:
             self.model = AutoModelForCausalLM.from_pretrained(
                 self.model_name,
                 **model_kwargs
             )
-        except ValueError as e:
-            if "accelerate" in str(e):
-                print("Warning: accelerate not found, falling back to manual device placement")
+        except (ImportError, ValueError) as e:
+            if attn_impl == "flash_attention_2" and (
+                isinstance(e, ImportError) or "flash" in str(e).lower()
+            ):
+                logger.info("Warning: flash-attn not available, falling back to SDPA")
+                model_kwargs["attn_implementation"] = "sdpa"
+                self.model = AutoModelForCausalLM.from_pretrained(
+                    self.model_name,
+                    **model_kwargs
+                )
+            elif "accelerate" in str(e):
+                logger.info("Warning: accelerate not found, falling back to manual device placement")
                 self.model = AutoModelForCausalLM.from_pretrained(
                     self.model_name,
                     torch_dtype=dtype,
@@ -114,15 +213,120 @@ class LocalModelAgent(BaseAgent):
             else:
                 raise
 
-        # Create text generation pipeline
-        # Note: When using device_map="auto", don't specify device parameter
-        self.pipe = pipeline(
-            "text-generation",
-            model=self.model,
-            tokenizer=self.tokenizer
+        # Optionally compile the model for decode: TorchInductor fuses the
+        # per-token kernels and removes Python overhead from the decode loop
+        self.use_static_cache = performance_config.get("use_static_cache", False)
+        if performance_config.get("use_torch_compile", False):
+            logger.info("Compiling model with torch.compile (mode=reduce-overhead)...")
+            self.model = torch.compile(
+                self.model,
+                mode="reduce-overhead",
+                fullgraph=False
+            )
+            # Warm up compilation with a dummy forward so the first real
+            # generation doesn't pay the compile latency
+            warmup_ids = torch.ones((1, 8), dtype=torch.long, device=self.model.device)
+            with torch.no_grad():
+                self.model(warmup_ids)
+
+        # Preallocate a device-side input_ids buffer so per-turn prompts are
+        # written into a fixed slice instead of allocating a fresh tensor and
+        # paying a synchronous H2D copy every call
+        self._ids_buf = None
+        self._ids_staging = None
+        if self.device == "cuda":
+            max_positions = getattr(self.model.config, "max_position_embeddings", 8192)
+            buf_len = min(
+                max_positions,
+                self.config.get("max_context_length", 8192) + self.max_new_tokens
+            )
+            self._ids_buf = torch.empty(
+                (1, buf_len), dtype=torch.long, device=self.model.device
+            )
+            # Matching pinned CPU staging buffer: pinning once here means
+            # the per-call path is two copies into existing memory, and
+            # the H2D leg can actually overlap (pin_memory() per call
+            # would allocate fresh pinned pages every generation)
+            self._ids_staging = torch.empty(
+                (1, buf_len), dtype=torch.long, pin_memory=True
+            )
+
+        # Precompute the generation config once instead of rebuilding
+        # sampling parameters on every generate() call
+        self.gen_config = self._build_generation_config()
+
+        logger.info(f"Model loaded successfully on {self.device}")
+
+    def _build_generation_config(self) -> GenerationConfig:
+        """
+        Build the generation config from the agent's sampling settings.
+
+        Uses a greedy fast-path when temperature is zero or config["greedy"]
+        is set: skipping the softmax + multinomial sample saves a little work
+        on every decoded token, which compounds over long generations.
+        """
+        if self.temperature <= 0 or self.config.get("greedy"):
+            return GenerationConfig(
+                max_new_tokens=self.max_new_tokens,
+                do_sample=False,
+                num_beams=1,
+                pad_token_id=self.tokenizer.eos_token_id
+            )
+        return GenerationConfig(
+            max_new_tokens=self.max_new_tokens,
+            temperature=self.temperature,
+            top_p=self.top_p,
+            do_sample=True,
+            pad_token_id=self.tokenizer.eos_token_id
+        )
+
+    def _load_vllm(self) -> None:
+        """
+        Load the model through vLLM instead of transformers.
+
+        vLLM's paged KV cache batches heterogeneous sequence lengths without
+        padding, continuous batching keeps the GPU saturated across episodes,
+        and enable_prefix_caching reuses KV entries for shared prompt
+        prefixes automatically — no manual cache management needed.
+        """
+        from vllm import LLM, SamplingParams
+
+        performance_config = self.config.get("performance", {})
+        quant_method = performance_config.get("quant_method")
+
+        self.llm = LLM(
+            model=self.model_name,
+            quantization=quant_method if quant_method in ("awq", "gptq") else None,
+            enable_prefix_caching=True,
+            trust_remote_code=True
+        )
+        self.sampling_params = SamplingParams(
+            max_tokens=self.max_new_tokens,
+            temperature=self.temperature,
+            top_p=self.top_p
         )
 
-        print(f"Model loaded successfully on {self.device}")
+        logger.info(f"Model loaded successfully via vLLM on {self.device}")
+
+    def _make_static_cache(self) -> StaticCache:
+        """
+        Allocate a fixed-shape StaticCache for generation.
+
+        Fixed-shape cache tensors let torch.compile capture CUDA graphs for
+        the decode loop instead of recompiling on every new sequence length.
+        """
+        max_positions = getattr(self.model.config, "max_position_embeddings", 8192)
+        cache_len = min(
+            max_positions,
+            self.config.get("max_context_length", 8192) + self.max_new_tokens
+        )
+        return StaticCache(
+            config=self.model.config,
+            max_batch_size=1,
+            max_cache_len=cache_len,
+            device=self.model.device,
+            dtype=self.model.dtype
+        )
 
     def generate_response(
         self,
@@ -139,34 +343,443 @@ class LocalModelAgent(BaseAgent):
         Returns:
             Generated response/action
         """
-        # Build prompt using the prompt manager
-        prompt = self.prompt_manager.build_prompt(
+        if self.engine in ("vllm", "vllm_http"):
+            prompt = self.prompt_manager.build_prompt(
+                observation=observation,
+                history=self.conversation_history,
+                context=context
+            )
+            if self.engine == "vllm_http":
+                response = self._vllm_http_complete(prompt)
+            else:
+                outputs = self.llm.generate([prompt], self.sampling_params)
+                response = outputs[0].outputs[0].text.strip()
+            self.update_history(observation, response)
+            return response
+
+        # Bring back any offloaded KV cache for this task before prefilling
+        if self._offload_kv and self.past_kv is None:
+            task_key = self._task_key(
+                context.get("task_description") if context else None
+            )
+            self._restore_offloaded_cache(task_key)
+
+        # Build the prompt directly as token ids: static fragments come from
+        # the prompt manager's cache, so only the dynamic pieces are encoded.
+        # The KV cache below then lets generate() skip re-prefilling the part
+        # of the prompt we already processed last turn.
+        cpu_ids = self.prompt_manager.build_token_ids(
             observation=observation,
             history=self.conversation_history,
             context=context
         )
+        input_ids = self._stage_input_ids(cpu_ids)
+
+        # Align the cached KV entries with the new prompt (prompts share a
+        # common prefix across turns: system prompt + earlier history)
+        self._sync_kv_cache(input_ids)
+
+        # With a static cache, preallocate the fixed-shape cache once so the
+        # compiled decode loop sees stable tensor shapes
+        if self.use_static_cache and self.past_kv is None and not self.kv_cache_quant:
+            self.past_kv = self._make_static_cache()
+
+        # Generate response, feeding the cache so only the new suffix is prefilled
+        gen_kwargs = {
+            "input_ids": input_ids,
+            "generation_config": self.gen_config,
+            "use_cache": True,
+            "return_dict_in_generate": True
+        }
+        if self.kv_cache_quant:
+            # Quantized caches can't be carried across turns (no crop), but
+            # int4/int8 keys and values cut decode cache bandwidth
+            gen_kwargs["cache_implementation"] = "quantized"
+            gen_kwargs["cache_config"] = {
+                "backend": self.kv_cache_quant,
+                "nbits": self.kv_cache_quant_bits
+            }
+        else:
+            gen_kwargs["past_key_values"] = self.past_kv
 
-        # Generate response
-        outputs = self.pipe(
-            prompt,
-            max_new_tokens=self.max_new_tokens,
-            temperature=self.temperature,
-            top_p=self.top_p,
-            do_sample=True,
-            return_full_text=False
-        )
+        outputs = self.model.generate(**gen_kwargs)
+
+        # Persist the cache (now covering prompt + generated tokens) for next turn
+        if not self.kv_cache_quant:
+            self.past_kv = outputs.past_key_values
+        self._last_prompt_ids = outputs.sequences
 
-        response = outputs[0]["generated_text"].strip()
+        # Decode only the newly generated tokens
+        response = self.tokenizer.decode(
+            outputs.sequences[0, input_ids.shape[1]:],
+            skip_special_tokens=True
+        ).strip()
 
         # Update history
         self.update_history(observation, response)
 
+        # Persist the static-prefix KV entries once per task so future
+        # episodes can skip re-prefilling the system prompt + task block
+        if context:
+            self._last_task_description = context.get("task_description")
+        self._maybe_persist_prefix_cache()
+
         return response
 
+    async def generate_async(self, prompt: str) -> str:
+        """
+        Complete one prompt asynchronously (stateless).
+
+        Awaiting several of these under asyncio.gather lets independent
+        generations overlap: the vllm/vllm_http backends batch concurrent
+        requests into shared forward passes, and the HF backend runs them
+        through the executor serialized by a lock (one GPU stream, no
+        cross-request state to corrupt).
+
+        Does not touch the cross-turn KV cache or conversation history;
+        callers own any per-episode state.
+
+        Args:
+            prompt: Complete prompt string
+
+        Returns:
+            Generated response text
+        """
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        if self.engine == "vllm_http":
+            return await loop.run_in_executor(
+                None, self._vllm_http_complete, prompt
+            )
+        if self.engine == "vllm":
+            outputs = await loop.run_in_executor(
+                None, self.llm.generate, [prompt], self.sampling_params
+            )
+            return outputs[0].outputs[0].text.strip()
+
+        def _blocking() -> str:
+            with self._gen_lock:
+                return self.generate_batch([prompt])[0]
+
+        return await loop.run_in_executor(None, _blocking)
+
+    def _vllm_http_complete(self, prompt: str, max_retries: int = 5) -> str:
+        """
+        Complete a prompt against the shared vLLM server.
+
+        POSTs to the OpenAI-compatible /v1/completions endpoint. 429
+        responses are the scheduler signalling backpressure, so they get
+        exponential-backoff retries instead of failing the episode.
+
+        Args:
+            prompt: Complete prompt string
+            max_retries: Attempts before giving up on 429/connection errors
+
+        Returns:
+            Generated completion text
+        """
+        payload = json.dumps({
+            "model": self.model_name,
+            "prompt": prompt,
+            "max_tokens": self.max_new_tokens,
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "stream": False
+        }).encode("utf-8")
+
+        headers = {"Content-Type": "application/json"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+
+        for attempt in range(max_retries):
+            request = urllib.request.Request(
+                f"{self.base_url}/v1/completions",
+                data=payload,
+                headers=headers
+            )
+            try:
+                with urllib.request.urlopen(request) as response:
+                    body = json.loads(response.read())
+                return body["choices"][0]["text"].strip()
+            except urllib.error.HTTPError as e:
+                if e.code != 429 or attempt == max_retries - 1:
+                    raise
+            except urllib.error.URLError:
+                if attempt == max_retries - 1:
+                    raise
+            time.sleep(2 ** attempt)
+
+        raise RuntimeError(f"vLLM server at {self.base_url} kept refusing requests")
+
+    def _stage_input_ids(self, cpu_ids: torch.Tensor) -> torch.Tensor:
+        """
+        Move prompt ids to the device, reusing the preallocated buffer.
+
+        Writing into fixed slices of the persistent buffers avoids
+        per-call allocator churn: the ids land in the preallocated pinned
+        staging buffer first, and the H2D transfer out of pinned memory
+        can overlap with kernel launches. Falls back to a plain
+        .to(device) when no buffer exists (CPU runs) or the prompt
+        exceeds the buffer.
+
+        Args:
+            cpu_ids: Prompt token ids on CPU (shape [1, seq_len])
+
+        Returns:
+            Device tensor view of the prompt ids
+        """
+        if self._ids_buf is None or cpu_ids.shape[1] > self._ids_buf.shape[1]:
+            return cpu_ids.to(self.model.device)
+
+        seq_len = cpu_ids.shape[1]
+        staged = self._ids_staging[:, :seq_len]
+        staged.copy_(cpu_ids)
+        self._ids_buf[:, :seq_len].copy_(staged, non_blocking=True)
+        return self._ids_buf[:, :seq_len]
+
+    def _static_prefix_ids(self) -> torch.Tensor:
+        """
+        Tokenize the static prompt prefix (system prompt + task description).
+
+        This reuses the prompt manager's cached fragments, so the ids line up
+        exactly with the start of every prompt built by build_token_ids.
+        """
+        pm = self.prompt_manager
+        pieces = [pm._fragment_ids("system", pm.SYSTEM_PROMPT + "\n", first=True)]
+        if self._last_task_description:
+            pre, post = pm.TASK_TEMPLATE.split("{task_description}")
+            pieces.append(pm._fragment_ids("task_pre", pre))
+            pieces.append(pm._dynamic_ids(self._last_task_description))
+            pieces.append(pm._fragment_ids("task_post", post + "\n"))
+        return torch.cat(pieces, dim=1)
+
+    def _maybe_persist_prefix_cache(self) -> None:
+        """Build and save the static prefix's KV cache if not already on disk."""
+        if self._prefix_cache_dir is None or self.engine == "vllm":
+            return
+
+        prefix_ids = self._static_prefix_ids()
+        digest = hashlib.sha256(prefix_ids.numpy().tobytes()).hexdigest()
+        if digest in self._prefix_saved:
+            return
+
+        self._prefix_cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._prefix_cache_dir / f"{digest}.pt"
+        if path.exists():
+            self._prefix_saved.add(digest)
+            return
+
+        # One forward pass over the prefix builds its KV entries
+        with torch.no_grad():
+            out = self.model(
+                prefix_ids.to(self.model.device),
+                use_cache=True
+            )
+        cache = out.past_key_values
+        legacy = cache.to_legacy_cache() if hasattr(cache, "to_legacy_cache") else cache
+        cpu_cache = tuple((k.cpu(), v.cpu()) for k, v in legacy)
+        torch.save((prefix_ids, cpu_cache), path)
+        self._prefix_saved.add(digest)
+        self._evict_prefix_caches()
+
+    def _load_prefix_cache(self) -> None:
+        """Seed the KV cache from disk for the current static prefix, if stored."""
+        if self._prefix_cache_dir is None or self.engine == "vllm":
+            return
+
+        prefix_ids = self._static_prefix_ids()
+        digest = hashlib.sha256(prefix_ids.numpy().tobytes()).hexdigest()
+        path = self._prefix_cache_dir / f"{digest}.pt"
+        if not path.exists():
+            return
+
+        stored_ids, cpu_cache = torch.load(path, map_location="cpu")
+        device = self.model.device
+        self.past_kv = DynamicCache.from_legacy_cache(
+            tuple((k.to(device), v.to(device)) for k, v in cpu_cache)
+        )
+        self._last_prompt_ids = stored_ids.to(device)
+
+    def _task_key(self, task_description: Optional[str]) -> str:
+        """Key identifying a task's offloaded cache slot."""
+        return task_description or "__default__"
+
+    def _offload_current_cache(self) -> None:
+        """Move the active KV cache to pinned CPU memory, keyed by task."""
+        cache = self.past_kv
+        if cache is None or not hasattr(cache, "to_legacy_cache"):
+            return
+
+        cpu_cache = []
+        for key, value in cache.to_legacy_cache():
+            cpu_key = torch.empty_like(key, device="cpu", pin_memory=True)
+            cpu_value = torch.empty_like(value, device="cpu", pin_memory=True)
+            cpu_key.copy_(key, non_blocking=True)
+            cpu_value.copy_(value, non_blocking=True)
+            cpu_cache.append((cpu_key, cpu_value))
+
+        task_key = self._task_key(self._last_task_description)
+        self._offloaded_caches[task_key] = (
+            self._last_prompt_ids.cpu() if self._last_prompt_ids is not None else None,
+            tuple(cpu_cache)
+        )
+
+    def _restore_offloaded_cache(self, task_key: str) -> None:
+        """Move an offloaded KV cache back to the GPU, overlapping the copies."""
+        entry = self._offloaded_caches.pop(task_key, None)
+        if entry is None:
+            return
+
+        stored_ids, cpu_cache = entry
+        device = self.model.device
+
+        if device.type == "cuda":
+            # Issue the H2D copies on a side stream so they overlap with any
+            # queued work before the prefill consumes the cache
+            stream = torch.cuda.Stream(device=device)
+            with torch.cuda.stream(stream):
+                legacy = tuple(
+                    (k.to(device, non_blocking=True), v.to(device, non_blocking=True))
+                    for k, v in cpu_cache
+                )
+            torch.cuda.current_stream(device).wait_stream(stream)
+        else:
+            legacy = tuple((k.to(device), v.to(device)) for k, v in cpu_cache)
+
+        self.past_kv = DynamicCache.from_legacy_cache(legacy)
+        if stored_ids is not None:
+            self._last_prompt_ids = stored_ids.to(device)
+
+    def _evict_prefix_caches(self) -> None:
+        """Drop the oldest cache files beyond the configured entry limit."""
+        files = sorted(
+            self._prefix_cache_dir.glob("*.pt"),
+            key=lambda p: p.stat().st_mtime
+        )
+        for stale in files[:-self._prefix_cache_max_entries]:
+            stale.unlink(missing_ok=True)
+
+    def generate_batch(self, prompts: List[str]) -> List[str]:
+        """
+        Generate responses for several prompts in one padded batch.
+
+        Batching amortizes kernel launches and keeps the GPU busier than
+        sequential batch-of-1 decoding. Prompts are left-padded (required
+        for causal LMs so generation continues from real tokens), and the
+        per-batch KV cache is managed internally by generate(), so rows can
+        differ in length freely between calls.
+
+        Note: this path does not touch the persistent cross-turn KV cache
+        or the conversation history; callers manage per-episode state.
+
+        Args:
+            prompts: List of complete prompt strings
+
+        Returns:
+            List of generated responses, one per prompt
+        """
+        if self.engine == "vllm":
+            # vLLM batches internally (continuous batching), no padding needed
+            outputs = self.llm.generate(prompts, self.sampling_params)
+            return [out.outputs[0].text.strip() for out in outputs]
+
+        if self.engine == "vllm_http":
+            # Fire requests concurrently; the server's continuous batching
+            # fuses in-flight prompts into shared forward passes
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(prompts)) as executor:
+                return list(executor.map(self._vllm_http_complete, prompts))
+
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+
+        prev_side = self.tokenizer.padding_side
+        self.tokenizer.padding_side = "left"
+        try:
+            inputs = self.tokenizer(
+                prompts,
+                return_tensors="pt",
+                padding=True
+            ).to(self.model.device)
+        finally:
+            self.tokenizer.padding_side = prev_side
+
+        outputs = self.model.generate(
+            input_ids=inputs.input_ids,
+            attention_mask=inputs.attention_mask,
+            generation_config=self.gen_config,
+            use_cache=True
+        )
+
+        new_tokens = outputs[:, inputs.input_ids.shape[1]:]
+        return [
+            self.tokenizer.decode(row, skip_special_tokens=True).strip()
+            for row in new_tokens
+        ]
+
+    def _sync_kv_cache(self, input_ids: "torch.Tensor") -> None:
+        """
+        Reconcile the persisted KV cache with a new prompt.
+
+        Keeps the cache only for the token prefix shared between the new
+        prompt and the previous turn's sequence, and drops it entirely when
+        the prompt diverges or would overflow the model's context window.
+
+        Args:
+            input_ids: Token ids of the new prompt (shape [1, seq_len])
+        """
+        if self.past_kv is None or self._last_prompt_ids is None:
+            return
+
+        # Reset the cache if the upcoming generation would overflow the context
+        max_positions = getattr(self.model.config, "max_position_embeddings", None)
+        if max_positions and input_ids.shape[1] + self.max_new_tokens > max_positions:
+            self.past_kv = None
+            self._last_prompt_ids = None
+            return
+
+        # Find the common token prefix between old and new sequences
+        prev_ids = self._last_prompt_ids[0].to(input_ids.device)
+        new_ids = input_ids[0]
+        max_len = min(prev_ids.shape[0], new_ids.shape[0])
+        matches = (prev_ids[:max_len] == new_ids[:max_len])
+        prefix_len = int(matches.cumprod(dim=0).sum().item())
+
+        if prefix_len == 0:
+            # Prompts diverge completely; start fresh
+            self.past_kv = None
+            self._last_prompt_ids = None
+            return
+
+        # Leave at least one token to prefill so generate() has valid input
+        prefix_len = min(prefix_len, new_ids.shape[0] - 1)
+
+        # Trim cached entries beyond the shared prefix
+        if self.past_kv.get_seq_length() > prefix_len:
+            if hasattr(self.past_kv, "crop"):
+                self.past_kv.crop(prefix_len)
+            else:
+                # StaticCache can't be cropped; keep the allocation but
+                # re-prefill it from scratch
+                self.past_kv.reset()
+
     def reset(self) -> None:
-        """Reset the agent's conversation history."""
+        """Reset the agent's conversation history and KV cache."""
         self.conversation_history = []
 
+        # Park the active cache in pinned CPU memory instead of discarding
+        # it, so returning to the same task skips its prefill
+        if self._offload_kv and self.past_kv is not None:
+            self._offload_current_cache()
+
+        self.past_kv = None
+        self._last_prompt_ids = None
+
+        # Re-seed the cache from disk so the new episode only prefills the
+        # dynamic suffix after the stored static prefix
+        self._load_prefix_cache()
+
     def save_checkpoint(self, path: str) -> None:
         """
         Save model checkpoint (if fine-tuned).
@@ -177,7 +790,7 @@ class LocalModelAgent(BaseAgent):
         if hasattr(self.model, 'save_pretrained'):
             self.model.save_pretrained(path)
             self.tokenizer.save_pretrained(path)
-            print(f"Checkpoint saved to {path}")
+            logger.info(f"Checkpoint saved to {path}")
         else:
             raise NotImplementedError("Model does not support checkpoint saving")
 
@@ -188,7 +801,7 @@ class LocalModelAgent(BaseAgent):
         Args:
             path: Path to load the checkpoint from
         """
-        print(f"Loading checkpoint from {path}...")
+        logger.info(f"Loading checkpoint from {path}...")
         self.model = AutoModelForCausalLM.from_pretrained(
             path,
             torch_dtype=torch.float16 if self.device == "cuda" else torch.float32,
@@ -197,11 +810,32 @@ class LocalModelAgent(BaseAgent):
         )
         self.tokenizer = AutoTokenizer.from_pretrained(path, trust_remote_code=True)
 
-        # Recreate pipeline
-        # Note: When using device_map, don't specify device parameter
-        self.pipe = pipeline(
-            "text-generation",
-            model=self.model,
-            tokenizer=self.tokenizer
-        )
-        print("Checkpoint loaded successfully")
+        # Rebuild the generation config against the new tokenizer
+        self.gen_config = self._build_generation_config()
+        logger.info("Checkpoint loaded successfully")
+
+    def load_adapter(self, adapter_path: str) -> None:
+        """
+        Hot-swap a PEFT adapter onto the already-loaded base model.
+
+        Swapping adapter weights (tens of MB) instead of reloading the
+        full checkpoint (tens of GB for a 7B model) lets callers such as
+        compare_models reuse one loaded base across many fine-tunes.
+
+        Args:
+            adapter_path: Path to the PEFT adapter checkpoint
+        """
+        from peft import PeftModel
+
+        logger.info(f"Loading adapter from {adapter_path}...")
+        if isinstance(self.model, PeftModel):
+            if adapter_path not in self.model.peft_config:
+                self.model.load_adapter(adapter_path, adapter_name=adapter_path)
+            self.model.set_adapter(adapter_path)
+        else:
+            self.model = PeftModel.from_pretrained(
+                self.model, adapter_path, adapter_name=adapter_path
+            )
+
+        # Cached KV entries were computed with the previous weights
+        self.reset()
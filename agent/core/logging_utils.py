@@ -0,0 +1,61 @@
+"""
+Buffered logging helpers shared across the agent package.
+
+Hot paths (episode loops, generation) used to log with bare print(),
+which flushes stdout and pays a kernel write syscall per call. The
+logger returned here writes through a buffered text wrapper and skips
+the per-record flush, so output is batched and flushed when the buffer
+fills or at interpreter shutdown.
+"""
+
+import io
+import logging
+import sys
+
+
+class BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler without the per-record flush.
+
+    Records accumulate in the underlying buffered stream and hit the
+    terminal when the buffer fills; logging.shutdown() (registered by the
+    logging module at exit) flushes whatever remains.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+# One buffered stream shared by every logger: a wrapper per logger name
+# would give each its own buffer flushing at its own pace, interleaving
+# output out of order across loggers
+_shared_stream = sys.stdout
+_raw_buffer = getattr(sys.stdout, "buffer", None)
+if _raw_buffer is not None:
+    _shared_stream = io.TextIOWrapper(_raw_buffer, write_through=False)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """
+    Get a logger writing buffered, unformatted lines to stdout.
+
+    All loggers returned here share one buffered stream, so lines from
+    different loggers hit the terminal in emission order.
+
+    Args:
+        name: Logger name (e.g. "mle_dojo.eval")
+
+    Returns:
+        Configured logger instance (configured once per name)
+    """
+    logger = logging.getLogger(name)
+    if not logger.handlers:
+        handler = BufferedStreamHandler(_shared_stream)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    return logger
@@ -5,7 +5,7 @@ This module provides templates and utilities for building effective prompts
 for the agent to interact with the environment.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 
 class PromptManager:
@@ -58,34 +58,26 @@ import pandas as pd
 - Your score improves when predictions are better
 - Think step-by-step and explain your reasoning before coding"""
 
-    # Template for the main task prompt
+    # Template for the (static) task description block
     TASK_TEMPLATE = """
 ## Competition Details
 {task_description}
-
-## Current Feedback from Environment
-{observation}
-
-## Your Next Action
-Based on the feedback above, decide your next step:
-
-1. If you need more information: Explain what you need to know
-2. If you're ready to code: Provide your reasoning, then write the code in a ```python``` block
-
-Think step-by-step:
-- What did the last action accomplish?
-- What information do I have now?
-- What should I do next to improve my solution?
 """
 
-    # Template with conversation history
+    # Template for the conversation history block
     HISTORY_TEMPLATE = """
 ## Previous Actions and Feedback
 {history}
+"""
 
+    # Template for the (dynamic) latest observation block
+    OBSERVATION_TEMPLATE = """
 ## Latest Feedback from Environment
 {observation}
+"""
 
+    # Static action instructions appended after the observation
+    ACTION_INSTRUCTIONS = """
 ## Analysis and Next Action
 Review what you've tried so far. Then:
 
@@ -96,14 +88,57 @@ Review what you've tried so far. Then:
 Remember: Iterate and improve! Each action should build on previous learning.
 """
 
-    def __init__(self, custom_templates: Optional[Dict[str, str]] = None):
+    # Default template lookup table, built once at class definition instead
+    # of per get_template call
+    _DEFAULT_TEMPLATES = {
+        "system": SYSTEM_PROMPT,
+        "task": TASK_TEMPLATE,
+        "history": HISTORY_TEMPLATE
+    }
+
+    def __init__(
+        self,
+        custom_templates: Optional[Dict[str, str]] = None,
+        cache_control_hook: Optional[Callable[[str, str], str]] = None,
+        tokenizer: Optional[Any] = None,
+        max_history_tokens: Optional[int] = None
+    ):
         """
         Initialize the prompt manager.
 
         Args:
             custom_templates: Optional custom prompt templates
+            cache_control_hook: Optional callable (block_name, block_text) -> text
+                used to mark cache breakpoints (e.g. provider cache_control
+                annotations) at the end of the static prompt blocks
+            tokenizer: Optional tokenizer used to budget history by tokens
+            max_history_tokens: Token budget for the history block; only used
+                when a tokenizer is provided
         """
         self.custom_templates = custom_templates or {}
+        self.cache_control_hook = cache_control_hook
+        self.tokenizer = tokenizer
+        self.max_history_tokens = max_history_tokens
+
+        # Token counts per turn, keyed by turn content (str hashes are
+        # memoized, so repeat lookups stay O(1)) so repeated formatting
+        # of the same history doesn't re-tokenize unchanged turns. The
+        # cache follows one history list and is dropped when that list
+        # is rebound or truncated, keeping it bounded by the live
+        # history rather than growing for the life of the process
+        self._turn_token_counts: Dict[tuple, int] = {}
+        self._counts_src: Optional[List[Dict[str, str]]] = None
+        self._counts_len = 0
+
+        # Pre-tokenized static fragments (system prompt, template scaffolding)
+        # so build_token_ids only tokenizes the dynamic pieces each turn
+        self._tok_cache: Dict[str, Any] = {}
+
+        # Memo of the last build inputs -> outputs; catches repeated
+        # observations (e.g. an idling environment) without rebuilding
+        self._last_key: Optional[tuple] = None
+        self._last_prompt: Optional[str] = None
+        self._last_ids: Optional[Any] = None
 
     def build_prompt(
         self,
@@ -121,33 +156,152 @@ Remember: Iterate and improve! Each action should build on previous learning.
 
         Returns:
             Complete prompt string
+
+        Note:
+            Blocks are emitted strictly in the order
+            [system, task, history, observation, instructions] so all static
+            content forms a stable prefix. This keeps KV/prompt-prefix caches
+            valid across turns: new turns only append to the history block
+            and replace the trailing dynamic blocks.
         """
-        parts = [self.SYSTEM_PROMPT]
+        key = self._memo_key(observation, history, context)
+        if key == self._last_key and self._last_prompt is not None:
+            return self._last_prompt
+
+        system_text = self.SYSTEM_PROMPT
+        if self.cache_control_hook:
+            system_text = self.cache_control_hook("system", system_text)
 
-        # Add task description if provided in context
+        parts = [system_text]
+
+        # Static task description comes right after the system prompt
         if context and "task_description" in context:
             parts.append(
                 self.TASK_TEMPLATE.format(
-                    task_description=context["task_description"],
-                    observation=observation
+                    task_description=context["task_description"]
                 )
             )
-        else:
-            # Use history template if we have history
-            if history and len(history) > 0:
-                history_text = self._format_history(history)
-                parts.append(
-                    self.HISTORY_TEMPLATE.format(
-                        history=history_text,
-                        observation=observation
-                    )
-                )
-            else:
-                # Simple prompt with just observation
-                parts.append(f"\n## Current Observation\n{observation}\n")
-                parts.append("\n## Your Response\n")
 
-        return "\n".join(parts)
+        # Frozen history turns: earlier turns are never rewritten
+        if history and len(history) > 0:
+            history_text = self.HISTORY_TEMPLATE.format(
+                history=self._format_history(history)
+            )
+            if self.cache_control_hook:
+                history_text = self.cache_control_hook("history", history_text)
+            parts.append(history_text)
+
+        # Dynamic tail: latest observation + static action instructions
+        parts.append(self.OBSERVATION_TEMPLATE.format(observation=observation))
+        parts.append(self.ACTION_INSTRUCTIONS)
+
+        prompt = "\n".join(parts)
+        self._memoize(key, prompt=prompt)
+        return prompt
+
+    def _memo_key(
+        self,
+        observation: str,
+        history: Optional[List[Dict[str, str]]],
+        context: Optional[Dict[str, Any]]
+    ) -> tuple:
+        """Cheap identity key for detecting duplicate build calls."""
+        # The last turn's identity distinguishes histories of equal
+        # length with different content — e.g. two batched episodes on
+        # the same competition receiving identical feedback strings
+        return (
+            observation,
+            len(history) if history else 0,
+            id(history[-1]) if history else None,
+            context.get("task_description") if context else None
+        )
+
+    def _memoize(self, key: tuple, prompt: Optional[str] = None, ids: Optional[Any] = None) -> None:
+        """Store the last build result, invalidating the sibling cache on key change."""
+        if key != self._last_key:
+            self._last_prompt = None
+            self._last_ids = None
+            self._last_key = key
+        if prompt is not None:
+            self._last_prompt = prompt
+        if ids is not None:
+            self._last_ids = ids
+
+    def build_token_ids(
+        self,
+        observation: str,
+        history: Optional[List[Dict[str, str]]] = None,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Build the prompt directly as token ids.
+
+        Assembles the same block order as build_prompt, but the static
+        fragments (system prompt, template scaffolding, action instructions)
+        are tokenized once and cached; only the dynamic pieces (observation,
+        task description, history text) are tokenized per call. Avoids
+        rebuilding and re-encoding a multi-kilobyte string every turn.
+
+        Args:
+            observation: Current observation from the environment
+            history: Previous observation-response pairs
+            context: Additional context (e.g. task description)
+
+        Returns:
+            input_ids tensor of shape [1, seq_len]
+        """
+        if self.tokenizer is None:
+            raise ValueError("build_token_ids requires a tokenizer")
+
+        key = self._memo_key(observation, history, context)
+        if key == self._last_key and self._last_ids is not None:
+            return self._last_ids
+
+        import torch
+
+        pieces = [self._fragment_ids("system", self.SYSTEM_PROMPT + "\n", first=True)]
+
+        if context and "task_description" in context:
+            pre, post = self.TASK_TEMPLATE.split("{task_description}")
+            pieces.append(self._fragment_ids("task_pre", pre))
+            pieces.append(self._dynamic_ids(context["task_description"]))
+            pieces.append(self._fragment_ids("task_post", post + "\n"))
+
+        if history and len(history) > 0:
+            pre, post = self.HISTORY_TEMPLATE.split("{history}")
+            pieces.append(self._fragment_ids("history_pre", pre))
+            pieces.append(self._dynamic_ids(self._format_history(history)))
+            pieces.append(self._fragment_ids("history_post", post + "\n"))
+
+        pre, post = self.OBSERVATION_TEMPLATE.split("{observation}")
+        pieces.append(self._fragment_ids("obs_pre", pre))
+        pieces.append(self._dynamic_ids(observation))
+        pieces.append(self._fragment_ids("obs_post", post + "\n"))
+        pieces.append(self._fragment_ids("instructions", self.ACTION_INSTRUCTIONS))
+
+        ids = torch.cat(pieces, dim=1)
+        self._memoize(key, ids=ids)
+        return ids
+
+    def _fragment_ids(self, name: str, text: str, first: bool = False) -> Any:
+        """Tokenize a static fragment once and cache the resulting ids."""
+        ids = self._tok_cache.get(name)
+        if ids is None:
+            ids = self.tokenizer(
+                text,
+                return_tensors="pt",
+                add_special_tokens=first
+            ).input_ids
+            self._tok_cache[name] = ids
+        return ids
+
+    def _dynamic_ids(self, text: str) -> Any:
+        """Tokenize a dynamic piece of the prompt (no caching)."""
+        return self.tokenizer(
+            text,
+            return_tensors="pt",
+            add_special_tokens=False
+        ).input_ids
 
     def _format_history(self, history: List[Dict[str, str]], max_turns: int = 10) -> str:
         """
@@ -155,13 +309,21 @@ Remember: Iterate and improve! Each action should build on previous learning.
 
         Args:
             history: List of observation-response pairs
-            max_turns: Maximum number of turns to include
+            max_turns: Maximum number of turns to include (fallback when no
+                tokenizer/token budget is configured)
 
         Returns:
             Formatted history string
         """
-        # Only include last N turns to avoid context overflow
-        recent_history = history[-max_turns:] if len(history) > max_turns else history
+        if self.tokenizer is not None and self.max_history_tokens:
+            # Budget by tokens rather than turns: one oversized observation
+            # would otherwise blow past the context window. Keep the most
+            # recent turns that fit, dropping only the oldest, so the cached
+            # prompt prefix stays intact.
+            recent_history = self._truncate_by_tokens(history)
+        else:
+            # Only include last N turns to avoid context overflow
+            recent_history = history[-max_turns:] if len(history) > max_turns else history
 
         formatted = []
         for i, turn in enumerate(recent_history, 1):
@@ -172,6 +334,54 @@ Remember: Iterate and improve! Each action should build on previous learning.
 
         return "\n".join(formatted)
 
+    def _truncate_by_tokens(
+        self,
+        history: List[Dict[str, str]]
+    ) -> List[Dict[str, str]]:
+        """
+        Select the most recent turns that fit in the token budget.
+
+        Walks the history newest-first, accumulating per-turn token
+        counts (cached by turn content, so a count can never go stale)
+        until the budget is exhausted, then restores chronological
+        order. The cache is additionally cleared whenever the history
+        list is rebound or shrinks, mirroring
+        BaseAgent.history_json_fragments, so it only holds counts for
+        the current history.
+
+        Args:
+            history: List of observation-response pairs
+
+        Returns:
+            Suffix of the history fitting within max_history_tokens
+        """
+        if self._counts_src is not history or len(history) < self._counts_len:
+            self._turn_token_counts.clear()
+            self._counts_src = history
+        self._counts_len = len(history)
+
+        selected = []
+        budget = self.max_history_tokens
+
+        for turn in reversed(history):
+            key = (turn['observation'], turn['response'])
+            token_count = self._turn_token_counts.get(key)
+            if token_count is None:
+                turn_text = (
+                    f"**Observation:** {turn['observation']}\n"
+                    f"**Response:** {turn['response']}"
+                )
+                token_count = len(self.tokenizer.encode(turn_text))
+                self._turn_token_counts[key] = token_count
+
+            if token_count > budget:
+                break
+            budget -= token_count
+            selected.append(turn)
+
+        selected.reverse()
+        return selected
+
     def build_reflection_prompt(self, trajectory: List[Dict[str, Any]]) -> str:
         """
         Build a prompt for reflecting on a completed trajectory.
@@ -214,15 +424,7 @@ Provide a brief reflection on each question.
         Returns:
             Template string
         """
-        # Check custom templates first
+        # Check custom templates first, then fall back to the class-level table
         if template_name in self.custom_templates:
             return self.custom_templates[template_name]
-
-        # Fall back to default templates
-        templates = {
-            "system": self.SYSTEM_PROMPT,
-            "task": self.TASK_TEMPLATE,
-            "history": self.HISTORY_TEMPLATE
-        }
-
-        return templates.get(template_name, "")
+        return self._DEFAULT_TEMPLATES.get(template_name, "")
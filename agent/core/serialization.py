@@ -0,0 +1,52 @@
+"""
+JSON serialization helpers shared across the agent package.
+
+Result and trajectory payloads grow linearly with episodes and carry
+long feedback strings; the stdlib encoder with indent=2 is among the
+slowest ways to write them. These helpers use orjson when it is
+installed (3-8x faster, handles numpy scalars natively) and fall back
+to the stdlib so nothing breaks in a minimal environment.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+
+    Args:
+        obj: JSON-serializable object
+        indent: Whether to pretty-print (use only for human-read files;
+            indentation inflates machine-consumed output ~3x)
+
+    Returns:
+        Encoded JSON as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, default=str).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def dump_json(obj: Any, path: Union[str, Path], indent: bool = True) -> None:
+    """
+    Serialize an object to a JSON file in one buffered write.
+
+    Args:
+        obj: JSON-serializable object
+        path: Destination file path
+        indent: Whether to pretty-print the output
+    """
+    Path(path).write_bytes(dumps_json(obj, indent=indent))
@@ -6,21 +6,322 @@ and generates detailed performance reports.
 """
 
 import argparse
+import functools
+import gzip
 import json
-import sys
+import os
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+import numpy as np
 
-from agent.core.local_model import LocalModelAgent
-from agent.wrappers.mledojo_wrapper import MLEDojoWrapper
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
 
-# Import MLE-Dojo components
-from mledojo.gym.env import KaggleEnvironment
-from mledojo.gym.competition import CompetitionRegistry, CompInfo
-from mledojo.competitions import get_metric
+from agent.core.logging_utils import get_logger
+from agent.core.serialization import dump_json, dumps_json
+
+logger = get_logger("mle_dojo.eval")
+
+# Heavy imports (torch/transformers via LocalModelAgent, and the MLE-Dojo
+# stack) are deferred into the functions that need them so the CLI starts
+# fast for --help and lightweight orchestration
+
+
+def _comp_dir_error(competition_name: str, mle_dojo_source: Path, data_dir: Path) -> str:
+    """Build the competition-data-missing message (failure path only)."""
+    return (
+        f"Competition data not found at {data_dir}\n"
+        f"Please prepare the competition first using:\n"
+        f"  cd {mle_dojo_source}\n"
+        f"  echo '{competition_name}' > prepare/comp.txt\n"
+        f"  PYTHONPATH='.' python prepare/mle.py --competitions-file prepare/comp.txt --data-dir data/prepared --logs-dir data/prepare_logs"
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _check_comp_dir(competition_name: str, mle_dojo_source: str) -> Path:
+    """
+    Probe a competition's prepared-data directory, once per process.
+
+    Every shard and every evaluate_agent call in compare_models repeats
+    this stat(); the result is invariant for a given competition, so it
+    is cached (failures are not cached, allowing retry after the data is
+    prepared). The long remediation message is only built on the failure
+    branch instead of eagerly on every call.
+
+    Args:
+        competition_name: Competition identifier
+        mle_dojo_source: Path to the MLE-Dojo checkout
+
+    Returns:
+        Path to the competition's prepared data directory
+
+    Raises:
+        FileNotFoundError: If the competition has not been prepared
+    """
+    source = Path(mle_dojo_source)
+    data_dir = source / "data" / "prepared" / competition_name / "data"
+    if not data_dir.exists():
+        raise FileNotFoundError(
+            _comp_dir_error(competition_name, source, data_dir)
+        )
+    return data_dir
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_metric(competition_name: str):
+    """
+    Resolve a competition's metric class once per process.
+
+    get_metric walks the competition package on every call; the result
+    is pure in the competition name, so memoize it.
+
+    Args:
+        competition_name: Competition identifier
+
+    Returns:
+        Metric class for the competition
+    """
+    from mledojo.competitions import get_metric
+    return get_metric(competition_name)
+
+
+def _reduce_scores_steps_impl(scores: np.ndarray, steps: np.ndarray):
+    """Pure-numpy reduction body; see _reduce_scores_steps."""
+    if scores.shape[0] == 0:
+        return 0.0, 0.0, 0.0, 0.0, 0
+    return (
+        float(scores.mean()),
+        float(scores.max()),
+        float(scores.min()),
+        float(steps.mean()),
+        int((steps > 0).sum())
+    )
+
+
+_reduce_fn = None
+
+
+def _reduce_scores_steps(scores: np.ndarray, steps: np.ndarray):
+    """
+    One vectorized pass over the per-episode score/step arrays.
+
+    Replaces four separate Python-level reductions; JIT-compiled with
+    numba when it is installed (the pure-numpy version is already a
+    single C-level pass per statistic). The numba import and the jit
+    compilation happen on first call, not at module import: numba costs
+    about a second to import, which would undo the deferred-heavy-import
+    work keeping CLI startup light.
+
+    Args:
+        scores: Best position score per episode (float64)
+        steps: Steps taken per episode (int64)
+
+    Returns:
+        (avg_score, max_score, min_score, avg_steps, episodes_with_steps)
+    """
+    global _reduce_fn
+    if _reduce_fn is None:
+        _reduce_fn = _reduce_scores_steps_impl
+        try:
+            from numba import njit
+        except ImportError:
+            pass
+        else:
+            _reduce_fn = njit(cache=True)(_reduce_scores_steps_impl)
+    return _reduce_fn(scores, steps)
+
+# Bumped whenever a metrics key is renamed, so stale result files fail
+# loudly at load time instead of KeyError-ing in a print statement
+METRICS_VERSION = 2
+
+
+def _aggregate(
+    best_scores: Any,
+    steps: Any,
+    success_count: int,
+    n_episodes: int
+) -> Dict[str, Any]:
+    """
+    Build the aggregate-metrics dictionary from per-episode values.
+
+    The single place the metrics schema is defined; evaluate_agent and
+    any re-aggregation path (e.g. the shard merger) should both use it.
+
+    Args:
+        best_scores: Best position score per episode (array-like)
+        steps: Steps taken per episode (array-like)
+        success_count: Number of successful episodes
+        n_episodes: Total episode count (denominator for rates)
+
+    Returns:
+        Metrics dictionary, including a metrics_version field
+    """
+    avg_score, max_score, min_score, avg_steps, with_steps = _reduce_scores_steps(
+        np.asarray(best_scores, dtype=np.float64),
+        np.asarray(steps, dtype=np.int64)
+    )
+    return {
+        "metrics_version": METRICS_VERSION,
+        "avg_best_position_score": avg_score,
+        "max_best_position_score": max_score,
+        "min_best_position_score": min_score,
+        "success_rate": success_count / n_episodes if n_episodes else 0.0,
+        "total_episodes": n_episodes,
+        "successful_episodes": success_count,
+        "avg_steps_taken": avg_steps,
+        "episodes_with_steps": with_steps
+    }
+
+
+def _run_episodes_batched(
+    wrapper: Any,
+    envs: List[Any],
+    max_steps: int,
+    verbose: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Run several episodes in lock-step, batching generation across them.
+
+    At each tick the outstanding prompts from all live episodes are sent
+    through a single `generate_batch` call, then each environment is
+    stepped with its own extracted action. This amortizes GPU launches
+    across episodes instead of decoding one batch-of-1 stream at a time.
+
+    Args:
+        wrapper: MLEDojoWrapper holding the agent (used for code extraction)
+        envs: List of KaggleEnvironment instances, one per episode
+        max_steps: Maximum number of steps per episode
+        verbose: Whether to print progress
+
+    Returns:
+        List of EpisodeResult objects (same shape as `run_episode`)
+    """
+    from agent.wrappers.mledojo_wrapper import EpisodeResult, _HAS_CODE_RE
+
+    agent = wrapper.agent
+
+    # Per-episode state, advanced in lock-step
+    states = []
+    for env in envs:
+        obs, _ = env.step("request_info", info_type="overview")
+        states.append({
+            "env": env,
+            "obs": obs,
+            "history": [],
+            "feedback_history": [],
+            "steps": 0
+        })
+
+    for step in range(max_steps):
+        # Build one prompt per live episode
+        prompts = []
+        for state in states:
+            feedback = state["obs"].get('feedback', {}).get('base', {}).get('feedback', '')
+            state["last_feedback"] = feedback
+            prompts.append(
+                agent.prompt_manager.build_prompt(
+                    observation=feedback,
+                    history=state["history"]
+                )
+            )
+
+        if verbose:
+            logger.info(f"\n--- Batched step {step + 1}/{max_steps} "
+                  f"({len(prompts)} episodes) ---")
+
+        responses = agent.generate_batch(prompts)
+
+        # Step each environment with its own action
+        for state, response in zip(states, responses):
+            env = state["env"]
+            state["history"].append({
+                "observation": state["last_feedback"],
+                "response": response
+            })
+            state["steps"] += 1
+
+            try:
+                if _HAS_CODE_RE.search(response):
+                    code = wrapper._extract_code(response)
+                    obs, step_reward = env.step("execute_code", code=code)
+                else:
+                    obs, step_reward = env.step("request_info", info_type="data_structure")
+            except ValueError:
+                obs, step_reward = env.step("request_info", info_type="data_structure")
+            except Exception as e:
+                try:
+                    obs, step_reward = env.step("request_info", info_type="overview")
+                except Exception:
+                    obs = {"feedback": {"base": {"feedback": f"Error: {str(e)}"}}, "action_status": "ERROR"}
+                    step_reward = 0.0
+
+            state["obs"] = obs
+            state["feedback_history"].append({
+                "step": state["steps"],
+                "action_status": obs.get('action_status', 'UNKNOWN'),
+                "reward": step_reward,
+                "cumulative_score": obs.get('current_position_score', 0.0)
+            })
+
+    # Assemble results in run_episode's shape
+    results = []
+    for state in states:
+        final_obs = state["obs"] or {}
+        results.append(EpisodeResult(
+            final_position_score=final_obs.get('current_position_score', 0.0),
+            best_position_score=final_obs.get('best_position_score', 0.0),
+            steps_taken=state["steps"],
+            feedback_history=state["feedback_history"],
+            final_observation=final_obs
+        ))
+
+    return results
+
+
+def _run_episodes_concurrent(
+    episode_indices: List[int],
+    max_concurrent: int,
+    run_one: Any
+) -> List[Dict[str, Any]]:
+    """
+    Run episodes concurrently on an executor, bounded by a semaphore.
+
+    Episode wall-time is dominated by environment steps and generation, so
+    overlapping episodes recovers orchestrator idle time. Each episode gets
+    its own agent/wrapper/env (no shared mutable state), which multiplies
+    GPU memory per concurrent episode unless a shared serving backend is
+    used.
+
+    Args:
+        episode_indices: Episode indices to run
+        max_concurrent: Maximum episodes in flight at once
+        run_one: Callable(episode_idx) -> episode result dict (blocking)
+
+    Returns:
+        Episode results in episode order
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    async def _driver():
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+
+            async def _bounded(episode: int):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, run_one, episode)
+
+            return await asyncio.gather(
+                *[_bounded(episode) for episode in episode_indices]
+            )
+
+    return asyncio.run(_driver())
 
 
 def evaluate_agent(
@@ -29,7 +330,11 @@ def evaluate_agent(
     output_dir: str,
     num_episodes: int = 10,
     benchmark: str = "default",
-    verbose: bool = True
+    verbose: bool = True,
+    max_concurrent_episodes: Optional[int] = None,
+    shard_id: int = 0,
+    num_shards: int = 1,
+    agent: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
     Evaluate agent on MLE-Dojo benchmark.
@@ -41,58 +346,111 @@ def evaluate_agent(
         num_episodes: Number of episodes to evaluate
         benchmark: Benchmark name/difficulty level
         verbose: Whether to print detailed progress
+        max_concurrent_episodes: Episodes to run in flight at once; defaults
+            to the eval.max_concurrent config value (1 = sequential)
+        shard_id: This process's shard index (see evaluate_parallel.py)
+        num_shards: Total number of shards; this process runs episodes
+            shard_id, shard_id + num_shards, ... and writes shard-local
+            result files for the launcher to merge
+        agent: Pre-loaded LocalModelAgent to reuse instead of loading
+            model_path from scratch (see compare_models adapter swapping)
 
     Returns:
-        Dictionary containing evaluation metrics
+        Dictionary containing evaluation metrics (for this shard's episodes)
     """
-    print("="*60)
-    print("Agent Evaluation")
-    print("="*60)
-    print(f"Model: {model_path}")
-    print(f"Benchmark: {benchmark}")
-    print(f"Episodes: {num_episodes}")
-    print("="*60)
-
-    # Load configuration
-    import yaml
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
-
-    # Initialize agent
-    print("\nLoading agent...")
-    agent = LocalModelAgent(model_name=model_path, config=config.get("agent", {}))
-
-    # Create wrapper
-    wrapper = MLEDojoWrapper(agent, config=config.get("wrapper", {}))
+    logger.info("="*60)
+    logger.info("Agent Evaluation")
+    logger.info("="*60)
+    logger.info(f"Model: {model_path}")
+    logger.info(f"Benchmark: {benchmark}")
+    logger.info(f"Episodes: {num_episodes}")
+    logger.info("="*60)
+
+    # Deferred heavy imports: keep module import (and CLI startup) light
+    from agent.core.local_model import LocalModelAgent
+    from agent.wrappers.mledojo_wrapper import MLEDojoWrapper
+    from mledojo.gym.env import KaggleEnvironment
+    from mledojo.gym.competition import CompetitionRegistry, CompInfo
+
+    # Load configuration (cached, compiled loader)
+    from agent.core.config_utils import load_config
+    config = load_config(config_path)
+
+    # Resolve the dispatch mode up front: the concurrent and best-of-p
+    # paths build fresh per-episode agents under their own caps, so
+    # loading the shared model here would only park an unused copy of
+    # the weights in VRAM and crowd out the per-episode loads
+    batch_episodes = config.get("evaluation", {}).get("batch_episodes", False)
+    if max_concurrent_episodes is None:
+        max_concurrent_episodes = config.get("eval", {}).get("max_concurrent", 1)
+    num_threads = config.get("eval", {}).get("num_threads", 1)
+    needs_shared_agent = (
+        batch_episodes
+        or (max_concurrent_episodes <= 1 and num_threads <= 1)
+    )
+
+    # Initialize agent, unless the caller supplied a pre-loaded one
+    wrapper = None
+    if agent is None:
+        if needs_shared_agent:
+            logger.info("\nLoading agent...")
+            agent = LocalModelAgent(model_name=model_path, config=config.get("agent", {}))
+    else:
+        # A supplied agent (e.g. compare_models' shared base with a
+        # swapped adapter) cannot be handed to the concurrent/best-of-p
+        # paths: they build fresh agents from model_path per episode,
+        # which silently drops the adapter swap and double-loads
+        # weights. Refuse the combination rather than mis-evaluate.
+        if not needs_shared_agent:
+            raise ValueError(
+                "A pre-loaded agent cannot be combined with "
+                "eval.max_concurrent > 1 or eval.num_threads > 1; these "
+                "paths construct fresh per-episode agents from "
+                "model_path and would ignore the supplied agent"
+            )
+        agent.reset()
+    if agent is not None:
+        wrapper = MLEDojoWrapper(agent, config=config.get("wrapper", {}))
 
     # Create output directory
     Path(output_dir).mkdir(parents=True, exist_ok=True)
 
-    # Evaluation results
+    # This shard's slice of the episode range (the full range when unsharded)
+    episode_indices = list(range(shard_id, num_episodes, num_shards))
+
+    # Offset any configured seed by shard so shards don't replay the same
+    # stochastic rollouts
+    seed = config.get("reproducibility", {}).get("seed")
+    if seed is not None:
+        import random
+        import torch
+        random.seed(seed + shard_id)
+        torch.manual_seed(seed + shard_id)
+
+    # Evaluation results. Per-episode records are streamed to a JSONL file
+    # instead of accumulating in memory; only aggregates live here.
+    if num_shards > 1:
+        stem = f"shard_{shard_id}_of_{num_shards}"
+    else:
+        stem = f"eval_results_{benchmark}"
+    episodes_path = Path(output_dir) / f"{stem}.jsonl"
     results = {
         "model_path": model_path,
         "benchmark": benchmark,
-        "num_episodes": num_episodes,
-        "episodes": [],
+        "num_episodes": len(episode_indices),
+        "shard_id": shard_id,
+        "num_shards": num_shards,
+        "episodes_file": str(episodes_path),
         "metrics": {}
     }
 
     # Initialize MLE-Dojo environment
-    print("\nInitializing MLE-Dojo environment...")
+    logger.info("\nInitializing MLE-Dojo environment...")
 
     # Get competition configuration from config or use default
     competition_name = config.get("competition", {}).get("name", "home-data-for-ml-course")
     mle_dojo_source = Path(__file__).parent.parent.parent / "MLE-Dojo"
-    competition_data_dir = mle_dojo_source / "data" / "prepared" / competition_name / "data"
-
-    if not competition_data_dir.exists():
-        raise FileNotFoundError(
-            f"Competition data not found at {competition_data_dir}\n"
-            f"Please prepare the competition first using:\n"
-            f"  cd {mle_dojo_source}\n"
-            f"  echo '{competition_name}' > prepare/comp.txt\n"
-            f"  PYTHONPATH='.' python prepare/mle.py --competitions-file prepare/comp.txt --data-dir data/prepared --logs-dir data/prepare_logs"
-        )
+    competition_data_dir = _check_comp_dir(competition_name, str(mle_dojo_source))
 
     # Create competition registry
     registry = CompetitionRegistry(
@@ -104,107 +462,342 @@ def evaluate_agent(
             output_type="submission.csv",
             higher_is_better=True
         ),
-        metric_class=get_metric(competition_name)
+        metric_class=_cached_metric(competition_name)
     )
 
     # Get environment configuration
     env_config = config.get("env", {})
     max_steps = env_config.get("max_steps", 10)
 
-    print(f"Competition: {competition_name}")
-    print(f"Max steps per episode: {max_steps}")
-    print()
+    logger.info(f"Competition: {competition_name}")
+    logger.info(f"Max steps per episode: {max_steps}")
+    logger.info("")
 
-    # Run evaluation episodes
-    total_reward = 0.0
-    success_count = 0
+    # Per-episode numeric state lives in preallocated struct-of-arrays
+    # buffers filled positionally (one slot per episode in this shard's
+    # slice); the human-readable dicts still stream to the JSONL file,
+    # but the metrics pass runs over these arrays in vectorized C code
+    # instead of re-walking a list of dicts.
+    n_local = len(episode_indices)
+    scores_arr = np.zeros(n_local, dtype=np.float64)
+    steps_arr = np.zeros(n_local, dtype=np.int64)
+    success_arr = np.zeros(n_local, dtype=bool)
+    slot_of = {episode: i for i, episode in enumerate(episode_indices)}
 
-    for episode in range(num_episodes):
-        if verbose:
-            print(f"\n{'='*60}")
-            print(f"Evaluating Episode {episode + 1}/{num_episodes}")
-            print(f"{'='*60}")
+    # A completed run's JSONL is the source of truth: records already on
+    # disk are counted into the arrays and their episodes skipped, so a
+    # rerun after a crash at episode K only pays for the episodes that
+    # never finished.
+    done_ids = set()
+    if episodes_path.exists():
+        with open(episodes_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                done_ids.add(row["episode_id"])
+                slot = slot_of.get(row["episode_id"])
+                if slot is not None:
+                    scores_arr[slot] = row.get("best_position_score", 0.0)
+                    steps_arr[slot] = row.get("steps_taken", 0)
+                    success_arr[slot] = bool(row.get("success"))
+        if done_ids:
+            logger.info(f"Resuming: {len(done_ids)} episodes already in {episodes_path}")
 
-        # Create fresh environment for each episode
+    # Invariant environment kwargs, computed once; the per-episode call
+    # varies only in output_dir, which also makes the call site trivially
+    # substitutable by the sharded launcher
+    env_kwargs = dict(
+        competition_name=competition_name,
+        competition_registry=registry,
+        render_mode="human" if verbose else None,
+        score_mode="position",
+        gpu_device=env_config.get("gpu_device", 0),
+        gpu_memory_limit=env_config.get("gpu_memory_limit", 32),
+        execution_timeout=env_config.get("execution_timeout", 600)
+    )
+
+    def _make_env(episode: int, thread: Optional[int] = None) -> Any:
         episode_output_dir = Path(output_dir) / f"episode_{episode}"
-        env = KaggleEnvironment.make(
-            competition_name=competition_name,
-            output_dir=str(episode_output_dir),
-            competition_registry=registry,
-            render_mode="human" if verbose else None,
-            score_mode="position",
-            gpu_device=env_config.get("gpu_device", 0),
-            gpu_memory_limit=env_config.get("gpu_memory_limit", 32),
-            execution_timeout=env_config.get("execution_timeout", 600)
+        if thread is not None:
+            episode_output_dir = episode_output_dir / f"thread_{thread}"
+        return KaggleEnvironment.make(
+            output_dir=str(episode_output_dir), **env_kwargs
         )
 
-        # Run episode using wrapper
-        episode_result = wrapper.run_episode(env, max_steps=max_steps, verbose=verbose)
+    # Optional env pooling: when eval.reuse_envs is set and the env's
+    # reset() can repoint output_dir, one environment (and its sandbox /
+    # data prep, often the dominant per-episode setup cost) is reused
+    # across sequential episodes instead of being rebuilt num_episodes
+    # times. Falls back to per-episode construction the first time reset
+    # refuses the output_dir kwarg.
+    reuse_envs = config.get("eval", {}).get("reuse_envs", False)
+    env_pool: List[Any] = []
+
+    def _acquire_env(episode: int) -> Any:
+        nonlocal reuse_envs
+        if not reuse_envs:
+            return _make_env(episode)
+        if env_pool:
+            env = env_pool[0]
+            episode_output_dir = Path(output_dir) / f"episode_{episode}"
+            try:
+                env.reset(output_dir=str(episode_output_dir))
+                return env
+            except TypeError:
+                logger.info("Env reset cannot repoint output_dir; "
+                            "disabling env reuse")
+                env.close()
+                env_pool.clear()
+                reuse_envs = False
+                return _make_env(episode)
+        env = _make_env(episode)
+        env_pool.append(env)
+        return env
 
-        # Extract detailed results
-        final_position_score = episode_result.get("final_position_score", 0.0)
-        best_position_score = episode_result.get("best_position_score", 0.0)
-        steps_taken = episode_result.get("steps_taken", 0)
+    def _release_env(env: Any) -> None:
+        if not reuse_envs:
+            env.close()
 
-        # Success is defined as achieving any positive position score
-        success = best_position_score > 0.0
+    def _run_one_episode(episode: int) -> Any:
+        # Fresh agent/wrapper per episode: concurrent episodes must not
+        # share conversation history or KV caches
+        episode_agent = LocalModelAgent(
+            model_name=model_path, config=config.get("agent", {})
+        )
+        episode_wrapper = MLEDojoWrapper(
+            episode_agent, config=config.get("wrapper", {})
+        )
+        env = _make_env(episode)
+        try:
+            return episode_wrapper.run_episode(
+                env, max_steps=max_steps, verbose=verbose
+            )
+        finally:
+            env.close()
 
-        episode_data = {
-            "episode_id": episode,
-            "final_position_score": float(final_position_score),
-            "best_position_score": float(best_position_score) if best_position_score is not None else 0.0,
-            "steps_taken": int(steps_taken),
-            "success": bool(success),
-            "feedback_history": episode_result.get("feedback_history", [])
+    def _run_episode_best_of(episode: int) -> Any:
+        """Split the step budget into p independent rollouts, keep the best.
+
+        At equal total interaction cost, the max over p independent
+        rollouts stochastically dominates a single rollout of p times the
+        length whenever late steps stop improving the score, so this trades
+        depth for restarts without raising the step budget.
+        """
+        if num_threads <= 1:
+            return _run_one_episode(episode)
+
+        thread_steps = max(1, max_steps // num_threads)
+
+        def _run_thread(thread: int) -> Any:
+            thread_agent = LocalModelAgent(
+                model_name=model_path, config=config.get("agent", {})
+            )
+            thread_wrapper = MLEDojoWrapper(
+                thread_agent, config=config.get("wrapper", {})
+            )
+            env = _make_env(episode, thread=thread)
+            try:
+                return thread_wrapper.run_episode(
+                    env, max_steps=thread_steps, verbose=False
+                )
+            finally:
+                env.close()
+
+        thread_results = _run_episodes_concurrent(
+            list(range(num_threads)), num_threads, _run_thread
+        )
+
+        # Keep the best-scoring rollout as the episode result; all
+        # sub-trajectories are retained for analysis
+        best = max(thread_results, key=lambda r: r.best_position_score)
+        best.threads = thread_results
+        return best
+
+    pending_indices = [e for e in episode_indices if e not in done_ids]
+
+    # Feedback histories carry the LLM's raw feedback strings (easily
+    # 10-100 KB per step), which used to bloat the episode records by
+    # orders of magnitude. Unless eval.inline_feedback asks for the old
+    # behaviour, each history is compressed into the episode directory
+    # and only a pointer + length stay inline.
+    inline_feedback = config.get("eval", {}).get("inline_feedback", False)
+
+    def _write_feedback(episode: int, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+        episode_dir = Path(output_dir) / f"episode_{episode}"
+        episode_dir.mkdir(parents=True, exist_ok=True)
+        payload = b"".join(dumps_json(entry) + b"\n" for entry in history)
+        if zstandard is not None:
+            feedback_path = episode_dir / "feedback.jsonl.zst"
+            feedback_path.write_bytes(
+                zstandard.ZstdCompressor(level=3).compress(payload)
+            )
+        else:
+            feedback_path = episode_dir / "feedback.jsonl.gz"
+            with gzip.open(feedback_path, 'wb', compresslevel=3) as f:
+                f.write(payload)
+        return {
+            "feedback_path": str(feedback_path),
+            "feedback_len": len(history)
         }
 
-        results["episodes"].append(episode_data)
+    try:
+        with open(episodes_path, 'ab', buffering=1 << 20) as episodes_file:
 
-        total_reward += best_position_score if best_position_score is not None else 0.0
-        if success:
-            success_count += 1
+            def _record_episode(episode: int, episode_result: Any) -> None:
+                # EpisodeResult fields are typed and slotted: direct
+                # attribute reads, no defensive .get defaults needed
+                best_position_score = episode_result.best_position_score
+                steps_taken = episode_result.steps_taken
 
-        if verbose:
-            print(f"Episode {episode + 1} - Best Position Score: {best_position_score:.4f}, "
-                  f"Steps: {steps_taken}, Success: {success}")
-
-        # Clean up environment
-        env.close()
-
-    # Calculate aggregate metrics
-    all_best_scores = [ep.get("best_position_score", 0.0) for ep in results["episodes"]]
-    all_steps = [ep.get("steps_taken", 0) for ep in results["episodes"]]
-
-    results["metrics"] = {
-        "avg_best_position_score": total_reward / num_episodes,
-        "max_best_position_score": max(all_best_scores) if all_best_scores else 0.0,
-        "min_best_position_score": min(all_best_scores) if all_best_scores else 0.0,
-        "success_rate": success_count / num_episodes,
-        "total_episodes": num_episodes,
-        "successful_episodes": success_count,
-        "avg_steps_taken": sum(all_steps) / len(all_steps) if all_steps else 0,
-        "episodes_with_steps": sum(1 for s in all_steps if s > 0)
-    }
+                # Success is defined as achieving any positive position score
+                success = best_position_score > 0.0
+
+                episode_data = {
+                    "episode_id": episode,
+                    "final_position_score": episode_result.final_position_score,
+                    "best_position_score": best_position_score,
+                    "steps_taken": steps_taken,
+                    "success": bool(success)
+                }
+                history = episode_result.feedback_history
+                if inline_feedback or not history:
+                    episode_data["feedback_history"] = history
+                else:
+                    episode_data.update(_write_feedback(episode, history))
+                if episode_result.threads is not None:
+                    episode_data["threads"] = [
+                        t.to_dict() for t in episode_result.threads
+                    ]
+
+                # Bytes straight into the pre-sized buffer (no str
+                # round-trip); flush each line so a process crash mid-run
+                # keeps every completed episode for the resume path. No
+                # fsync: page-cache durability is enough for that, and
+                # forcing the disk per record would defeat the buffer.
+                episodes_file.write(dumps_json(episode_data) + b"\n")
+                episodes_file.flush()
+
+                slot = slot_of[episode]
+                scores_arr[slot] = episode_data["best_position_score"]
+                steps_arr[slot] = episode_data["steps_taken"]
+                success_arr[slot] = success
+
+                if verbose:
+                    logger.info(f"Episode {episode + 1} - Best Position Score: {best_position_score:.4f}, "
+                          f"Steps: {steps_taken}, Success: {success}")
+
+            if batch_episodes and pending_indices:
+                # Advance all episodes in lock-step, batching generation across them
+                logger.info(f"Running {len(pending_indices)} episodes batched...")
+                envs = [_make_env(episode) for episode in pending_indices]
+                try:
+                    episode_results = _run_episodes_batched(
+                        wrapper, envs, max_steps=max_steps, verbose=verbose
+                    )
+                finally:
+                    for env in envs:
+                        env.close()
+                for episode, episode_result in zip(pending_indices, episode_results):
+                    _record_episode(episode, episode_result)
+            elif max_concurrent_episodes > 1:
+                # Overlap episodes: env stepping and generation leave the
+                # orchestrator idle, so gather them under a concurrency cap
+                logger.info(f"Running {len(pending_indices)} episodes with up to "
+                            f"{max_concurrent_episodes} in flight...")
+                episode_results = _run_episodes_concurrent(
+                    pending_indices, max_concurrent_episodes, _run_episode_best_of
+                )
+                for episode, episode_result in zip(pending_indices, episode_results):
+                    _record_episode(episode, episode_result)
+            else:
+                for episode in pending_indices:
+                    if verbose:
+                        logger.info(f"\n{'='*60}")
+                        logger.info(f"Evaluating Episode {episode + 1}/{num_episodes}")
+                        logger.info(f"{'='*60}")
+
+                    if num_threads > 1:
+                        # Best-of-p: p short rollouts instead of one long one
+                        _record_episode(episode, _run_episode_best_of(episode))
+                        continue
+
+                    # Fresh environment per episode, or a pooled one when
+                    # eval.reuse_envs is enabled
+                    env = _acquire_env(episode)
+
+                    # Run episode using wrapper, stream its record out immediately
+                    _record_episode(
+                        episode,
+                        wrapper.run_episode(env, max_steps=max_steps, verbose=verbose)
+                    )
+
+                    # Clean up environment (no-op for pooled envs)
+                    _release_env(env)
+    finally:
+        # Close any pooled environments
+        for env in env_pool:
+            env.close()
+
+    # Calculate aggregate metrics in one vectorized pass over the arrays
+    results["metrics"] = _aggregate(
+        scores_arr, steps_arr, int(success_arr.sum()), n_local
+    )
 
     # Save results
-    results_path = Path(output_dir) / f"eval_results_{benchmark}.json"
-    with open(results_path, 'w') as f:
-        json.dump(results, f, indent=2)
-
-    print("\n" + "="*60)
-    print("Evaluation Complete!")
-    print("="*60)
-    print(f"Average Best Position Score: {results['metrics']['avg_best_position_score']:.4f}")
-    print(f"Max Position Score: {results['metrics']['max_best_position_score']:.4f}")
-    print(f"Success Rate: {results['metrics']['success_rate']:.2%}")
-    print(f"Avg Steps Taken: {results['metrics']['avg_steps_taken']:.1f}")
-    print(f"Episodes with Actions: {results['metrics']['episodes_with_steps']}/{num_episodes}")
-    print(f"Results saved to: {results_path}")
-    print("="*60)
+    results_path = Path(output_dir) / f"{stem}.json"
+    dump_json(results, results_path)
+
+    logger.info("\n" + "="*60)
+    logger.info("Evaluation Complete!")
+    logger.info("="*60)
+    logger.info(f"Average Best Position Score: {results['metrics']['avg_best_position_score']:.4f}")
+    logger.info(f"Max Position Score: {results['metrics']['max_best_position_score']:.4f}")
+    logger.info(f"Success Rate: {results['metrics']['success_rate']:.2%}")
+    logger.info(f"Avg Steps Taken: {results['metrics']['avg_steps_taken']:.1f}")
+    logger.info(f"Episodes with Actions: {results['metrics']['episodes_with_steps']}/{n_local}")
+    logger.info(f"Results saved to: {results_path}")
+    logger.info("="*60)
 
     return results
 
 
+def _evaluate_model_on_device(
+    model_path: str,
+    config_path: str,
+    output_dir: str,
+    num_episodes: int,
+    device_index: int
+) -> Dict[str, Any]:
+    """
+    Worker entry point: evaluate one model pinned to one CUDA device.
+
+    Sets CUDA_VISIBLE_DEVICES before torch is imported in this process so
+    the allocator binds to the assigned GPU.
+
+    Args:
+        model_path: Model path to evaluate
+        config_path: Path to evaluation configuration
+        output_dir: Directory for this model's results
+        num_episodes: Number of episodes to evaluate
+        device_index: CUDA device to pin this worker to
+
+    Returns:
+        Evaluation results dictionary from evaluate_agent
+    """
+    import os
+    os.environ["CUDA_VISIBLE_DEVICES"] = str(device_index)
+
+    return evaluate_agent(
+        model_path=model_path,
+        config_path=config_path,
+        output_dir=output_dir,
+        num_episodes=num_episodes,
+        verbose=False
+    )
+
+
 def compare_models(
     model_paths: List[str],
     config_path: str,
@@ -214,45 +807,145 @@ def compare_models(
     """
     Compare multiple models on the same benchmark.
 
+    With multiple CUDA devices available, models are evaluated in parallel
+    with one worker process per GPU (each worker writes its results under
+    its own subdirectory of output_dir); otherwise they run sequentially.
+
     Args:
         model_paths: List of model paths to compare
         config_path: Path to evaluation configuration
         output_dir: Directory to save comparison results
         num_episodes: Number of episodes per model
     """
-    print("="*60)
-    print("Model Comparison")
-    print("="*60)
-    print(f"Models: {len(model_paths)}")
-    print(f"Episodes per model: {num_episodes}")
-    print("="*60)
-
-    comparison_results = []
-
-    for model_path in model_paths:
-        print(f"\nEvaluating: {model_path}")
-        result = evaluate_agent(
-            model_path=model_path,
-            config_path=config_path,
-            output_dir=output_dir,
-            num_episodes=num_episodes,
-            verbose=False
-        )
-        comparison_results.append(result)
+    logger.info("="*60)
+    logger.info("Model Comparison")
+    logger.info("="*60)
+    logger.info(f"Models: {len(model_paths)}")
+    logger.info(f"Episodes per model: {num_episodes}")
+    logger.info("="*60)
+
+    try:
+        import torch
+        n_gpus = torch.cuda.device_count()
+    except ImportError:
+        n_gpus = 0
+
+    if n_gpus > 1 and len(model_paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        import multiprocessing
 
-    # Save comparison
+        n_workers = min(n_gpus, len(model_paths))
+        logger.info(f"\nDispatching models across {n_workers} GPUs...")
+
+        results_by_model = {}
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _evaluate_model_on_device,
+                    model_path,
+                    config_path,
+                    str(Path(output_dir) / f"model_{i}"),
+                    num_episodes,
+                    i % n_gpus
+                ): model_path
+                for i, model_path in enumerate(model_paths)
+            }
+            for future in as_completed(futures):
+                model_path = futures[future]
+                logger.info(f"Completed: {model_path}")
+                results_by_model[model_path] = future.result()
+
+        # Preserve the caller's model ordering in the output
+        comparison_results = [results_by_model[mp] for mp in model_paths]
+    else:
+        # When the compared checkpoints are PEFT adapters over one base
+        # (agent.base_model in the config), load the base once and swap
+        # adapters per model instead of paying a full weight load each time
+        shared_agent = None
+        from agent.core.config_utils import load_config
+        agent_config = load_config(config_path).get("agent", {})
+        base_model = agent_config.get("base_model")
+        if base_model:
+            from agent.core.local_model import LocalModelAgent
+            logger.info(f"\nLoading shared base model: {base_model}")
+            shared_agent = LocalModelAgent(
+                model_name=base_model, config=agent_config
+            )
+
+        comparison_results = []
+        for i, model_path in enumerate(model_paths):
+            logger.info(f"\nEvaluating: {model_path}")
+            if shared_agent is not None:
+                shared_agent.load_adapter(model_path)
+            # Each model gets its own subdirectory (matching the
+            # multi-GPU branch): a shared episodes JSONL would make the
+            # resume logic treat model 1's episodes as already done for
+            # every later model
+            result = evaluate_agent(
+                model_path=model_path,
+                config_path=config_path,
+                output_dir=str(Path(output_dir) / f"model_{i}"),
+                num_episodes=num_episodes,
+                verbose=False,
+                agent=shared_agent
+            )
+            comparison_results.append(result)
+
+    # Save comparison. The JSON holds only per-model aggregates (bounded
+    # regardless of episode count); the per-episode detail is flattened
+    # into one table read back from each model's episode JSONL, so the
+    # comparison output stays linear in total episodes.
     comparison_path = Path(output_dir) / "model_comparison.json"
-    with open(comparison_path, 'w') as f:
-        json.dump(comparison_results, f, indent=2)
+    dump_json(
+        [
+            {"model_path": r["model_path"], "metrics": r["metrics"]}
+            for r in comparison_results
+        ],
+        comparison_path
+    )
 
-    print("\n" + "="*60)
-    print("Comparison Results")
-    print("="*60)
+    rows = []
     for result in comparison_results:
-        print(f"\nModel: {result['model_path']}")
-        print(f"  Avg Reward: {result['metrics']['avg_reward']:.2f}")
-        print(f"  Success Rate: {result['metrics']['success_rate']:.2%}")
-    print("="*60)
+        episodes_file = result.get("episodes_file")
+        if not episodes_file or not Path(episodes_file).exists():
+            continue
+        with open(episodes_file, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                row = json.loads(line)
+                rows.append((
+                    result["model_path"],
+                    row.get("episode_id"),
+                    row.get("best_position_score", 0.0),
+                    row.get("steps_taken", 0),
+                    bool(row.get("success"))
+                ))
+    if rows:
+        import pandas as pd
+        table = pd.DataFrame(
+            rows,
+            columns=["model_path", "episode_id", "best_position_score",
+                     "steps_taken", "success"]
+        )
+        try:
+            table.to_parquet(Path(output_dir) / "comparison.parquet")
+        except ImportError:
+            # No parquet engine installed; CSV is still flat and linear
+            table.to_csv(Path(output_dir) / "comparison.csv", index=False)
+
+    logger.info("\n" + "="*60)
+    logger.info("Comparison Results")
+    logger.info("="*60)
+    for result in comparison_results:
+        logger.info(f"\nModel: {result['model_path']}")
+        logger.info(f"  Avg Best Position Score: {result['metrics']['avg_best_position_score']:.4f}")
+        logger.info(f"  Success Rate: {result['metrics']['success_rate']:.2%}")
+    logger.info("="*60)
 
 
 def main():
@@ -300,6 +993,24 @@ def main():
         nargs="+",
         help="Compare multiple models (provide list of paths)"
     )
+    parser.add_argument(
+        "--max-concurrent-episodes",
+        type=int,
+        default=None,
+        help="Episodes to run concurrently (default: eval.max_concurrent config, 1)"
+    )
+    parser.add_argument(
+        "--shard-id",
+        type=int,
+        default=0,
+        help="Shard index for parallel evaluation (see evaluate_parallel.py)"
+    )
+    parser.add_argument(
+        "--num-shards",
+        type=int,
+        default=1,
+        help="Total number of evaluation shards"
+    )
 
     args = parser.parse_args()
 
@@ -317,7 +1028,10 @@ def main():
             output_dir=args.output_dir,
             num_episodes=args.num_episodes,
             benchmark=args.benchmark,
-            verbose=args.verbose
+            verbose=args.verbose,
+            max_concurrent_episodes=args.max_concurrent_episodes,
+            shard_id=args.shard_id,
+            num_shards=args.num_shards
         )
 
 
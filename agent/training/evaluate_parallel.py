@@ -0,0 +1,218 @@
+"""
+Sharded parallel evaluation launcher.
+
+Spawns K subprocess shards of agent.training.evaluate, each running a
+strided slice of the episode range on its own GPU (when several are
+available), then merges the shard outputs into the usual
+eval_results_<benchmark> files. A single eval process serializes model
+generation on one GPU context; sharding reaches K-way aggregate
+throughput with zero inter-process communication.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+from agent.core.logging_utils import get_logger
+
+logger = get_logger("mle_dojo.eval")
+
+
+def launch_shards(
+    model_path: str,
+    config_path: str,
+    output_dir: str,
+    num_episodes: int,
+    num_shards: int,
+    benchmark: str = "default"
+) -> List[subprocess.Popen]:
+    """
+    Spawn one evaluate.py subprocess per shard.
+
+    Each shard is pinned to a GPU round-robin via CUDA_VISIBLE_DEVICES and
+    gets an even share of the CPU threads via OMP_NUM_THREADS.
+
+    Args:
+        model_path: Model path to evaluate
+        config_path: Path to evaluation configuration
+        output_dir: Shared output directory
+        num_episodes: Total episodes across all shards
+        num_shards: Number of subprocess shards
+        benchmark: Benchmark name passed through to evaluate.py
+
+    Returns:
+        List of Popen handles, one per shard
+    """
+    try:
+        import torch
+        n_gpus = torch.cuda.device_count()
+    except ImportError:
+        n_gpus = 0
+
+    cpu_count = os.cpu_count() or 1
+    threads_per_shard = max(1, cpu_count // num_shards)
+
+    processes = []
+    for shard_id in range(num_shards):
+        env = os.environ.copy()
+        env["OMP_NUM_THREADS"] = str(threads_per_shard)
+        if n_gpus > 0:
+            env["CUDA_VISIBLE_DEVICES"] = str(shard_id % n_gpus)
+
+        cmd = [
+            sys.executable, "-m", "agent.training.evaluate",
+            "--model-path", model_path,
+            "--config", config_path,
+            "--output-dir", output_dir,
+            "--num-episodes", str(num_episodes),
+            "--benchmark", benchmark,
+            "--shard-id", str(shard_id),
+            "--num-shards", str(num_shards)
+        ]
+        logger.info(f"Launching shard {shard_id}/{num_shards}...")
+        processes.append(subprocess.Popen(cmd, env=env))
+
+    return processes
+
+
+def merge_shards(
+    output_dir: str,
+    num_shards: int,
+    benchmark: str = "default"
+) -> dict:
+    """
+    Merge shard result files into the standard eval output files.
+
+    Concatenates the per-shard episode JSONL files and recomputes the
+    aggregate metrics over all episodes.
+
+    Args:
+        output_dir: Directory containing the shard outputs
+        num_shards: Number of shards to merge
+        benchmark: Benchmark name used for the merged file names
+
+    Returns:
+        Merged results dictionary
+    """
+    out = Path(output_dir)
+    merged_episodes_path = out / f"eval_results_{benchmark}.jsonl"
+
+    best_scores: List[float] = []
+    steps: List[int] = []
+    success_count = 0
+    model_path = None
+
+    with open(merged_episodes_path, 'w') as merged:
+        for shard_id in range(num_shards):
+            shard_jsonl = out / f"shard_{shard_id}_of_{num_shards}.jsonl"
+            with open(shard_jsonl, 'r') as f:
+                for line in f:
+                    merged.write(line)
+                    episode = json.loads(line)
+                    best_scores.append(episode.get("best_position_score", 0.0))
+                    steps.append(episode.get("steps_taken", 0))
+                    if episode.get("success"):
+                        success_count += 1
+
+            shard_json = out / f"shard_{shard_id}_of_{num_shards}.json"
+            if model_path is None and shard_json.exists():
+                with open(shard_json, 'r') as f:
+                    model_path = json.load(f).get("model_path")
+
+    # Reuse the evaluator's aggregator so the metrics schema lives in
+    # exactly one place
+    from agent.training.evaluate import _aggregate
+
+    n = len(best_scores)
+    results = {
+        "model_path": model_path,
+        "benchmark": benchmark,
+        "num_episodes": n,
+        "num_shards": num_shards,
+        "episodes_file": str(merged_episodes_path),
+        "metrics": _aggregate(best_scores, steps, success_count, n)
+    }
+
+    results_path = out / f"eval_results_{benchmark}.json"
+    with open(results_path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    logger.info(f"Merged {n} episodes from {num_shards} shards into {results_path}")
+    return results
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Run sharded parallel evaluation"
+    )
+    parser.add_argument(
+        "--model-path",
+        type=str,
+        required=True,
+        help="Path to trained model or checkpoint"
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="agent/configs/eval_config.yaml",
+        help="Path to evaluation configuration file"
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default="experiments/evaluations",
+        help="Directory to save evaluation results"
+    )
+    parser.add_argument(
+        "--num-episodes",
+        type=int,
+        default=10,
+        help="Total number of episodes across all shards"
+    )
+    parser.add_argument(
+        "--num-shards",
+        type=int,
+        default=2,
+        help="Number of subprocess shards to launch"
+    )
+    parser.add_argument(
+        "--benchmark",
+        type=str,
+        default="default",
+        help="Benchmark name or difficulty level"
+    )
+
+    args = parser.parse_args()
+
+    processes = launch_shards(
+        model_path=args.model_path,
+        config_path=args.config,
+        output_dir=args.output_dir,
+        num_episodes=args.num_episodes,
+        num_shards=args.num_shards,
+        benchmark=args.benchmark
+    )
+
+    failed = 0
+    for shard_id, process in enumerate(processes):
+        if process.wait() != 0:
+            logger.info(f"Shard {shard_id} exited with code {process.returncode}")
+            failed += 1
+
+    if failed:
+        sys.exit(1)
+
+    merge_shards(
+        output_dir=args.output_dir,
+        num_shards=args.num_shards,
+        benchmark=args.benchmark
+    )
+
+
+if __name__ == "__main__":
+    main()
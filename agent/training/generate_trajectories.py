@@ -6,15 +6,11 @@ trajectories that can be used for supervised fine-tuning or RL training.
 """
 
 import argparse
-import json
-import sys
 from pathlib import Path
 from typing import List, Dict, Any
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 from agent.core.local_model import LocalModelAgent
+from agent.core.serialization import dump_json, dumps_json
 from agent.wrappers.mledojo_wrapper import MLEDojoWrapper
 
 
@@ -24,7 +20,7 @@ def collect_trajectories(
     config_path: str,
     output_dir: str,
     max_steps_per_episode: int = 100
-) -> List[Dict[str, Any]]:
+) -> Dict[str, Any]:
     """
     Collect trajectories by running the agent.
 
@@ -36,12 +32,11 @@ def collect_trajectories(
         max_steps_per_episode: Maximum steps per episode
 
     Returns:
-        List of trajectory dictionaries
+        Summary dictionary with collection aggregates
     """
-    # Load configuration
-    import yaml
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    # Load configuration (cached, compiled loader)
+    from agent.core.config_utils import load_config
+    config = load_config(config_path)
 
     # Initialize agent
     print(f"Initializing agent with model: {model_name}")
@@ -55,53 +50,65 @@ def collect_trajectories(
     print("\nWARNING: MLE-Dojo environment initialization not yet implemented")
     print("This is a template that needs to be completed once the environment is set up\n")
 
-    trajectories = []
-
-    for episode in range(num_episodes):
-        print(f"\n{'='*60}")
-        print(f"Episode {episode + 1}/{num_episodes}")
-        print(f"{'='*60}")
-
-        # Reset for new episode
-        wrapper.reset()
-
-        # TODO: Run episode in actual MLE-Dojo environment
-        # episode_data = wrapper.run_episode(env, max_steps=max_steps_per_episode)
-
-        # Placeholder trajectory structure
-        episode_data = {
-            "episode_id": episode,
-            "steps": [],
-            "total_reward": 0.0,
-            "success": False
-        }
-
-        trajectories.append(episode_data)
-
-        # Save trajectory
-        output_path = Path(output_dir) / f"trajectory_{episode:04d}.json"
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-
-        with open(output_path, 'w') as f:
-            json.dump(episode_data, f, indent=2)
-
-        print(f"Saved trajectory to {output_path}")
-
-    # Save summary
+    # Stream trajectories to one append-only JSONL file instead of a JSON
+    # file per episode plus a summary embedding every trajectory. That old
+    # layout rewrote all collected data into summary.json at the end
+    # (O(N^2) I/O over a run) and held every trajectory in RAM; a JSONL
+    # line per episode is O(N) and needs only running aggregates.
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    trajectories_path = out / "trajectories.jsonl"
+
+    n_collected = 0
+    sum_reward = 0.0
+    n_success = 0
+
+    with open(trajectories_path, 'ab', buffering=1 << 20) as trajectories_file:
+        for episode in range(num_episodes):
+            print(f"\n{'='*60}")
+            print(f"Episode {episode + 1}/{num_episodes}")
+            print(f"{'='*60}")
+
+            # Reset for new episode
+            wrapper.reset()
+
+            # TODO: Run episode in actual MLE-Dojo environment
+            # episode_data = wrapper.run_episode(env, max_steps=max_steps_per_episode)
+
+            # Placeholder trajectory structure
+            episode_data = {
+                "episode_id": episode,
+                "steps": [],
+                "total_reward": 0.0,
+                "success": False
+            }
+
+            # Compact encoding: these lines are machine-consumed, and
+            # indentation roughly triples file size for no benefit
+            trajectories_file.write(dumps_json(episode_data) + b"\n")
+
+            n_collected += 1
+            sum_reward += episode_data.get("total_reward", 0.0)
+            if episode_data.get("success"):
+                n_success += 1
+
+    # Save a small summary of aggregates (the trajectories themselves
+    # live in the JSONL file)
     summary = {
-        "num_episodes": num_episodes,
+        "num_episodes": n_collected,
         "model_name": model_name,
-        "trajectories": trajectories
+        "trajectories_file": str(trajectories_path),
+        "avg_reward": sum_reward / n_collected if n_collected else 0.0,
+        "success_rate": n_success / n_collected if n_collected else 0.0
     }
 
-    summary_path = Path(output_dir) / "summary.json"
-    with open(summary_path, 'w') as f:
-        json.dump(summary, f, indent=2)
+    summary_path = out / "summary.json"
+    dump_json(summary, summary_path)
 
     print(f"\nTrajectory collection complete!")
-    print(f"Saved {len(trajectories)} trajectories to {output_dir}")
+    print(f"Saved {n_collected} trajectories to {trajectories_path}")
 
-    return trajectories
+    return summary
 
 
 def main():
@@ -6,13 +6,9 @@ including policy optimization, reward shaping, and checkpointing.
 """
 
 import argparse
-import sys
 from pathlib import Path
 from typing import Optional
 
-# Add parent directory to path
-sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-
 
 def train_rl(
     trajectories_dir: str,
@@ -37,10 +33,9 @@ def train_rl(
     print("RL Training Script")
     print("="*60)
 
-    # Load configuration
-    import yaml
-    with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+    # Load configuration (cached, compiled loader)
+    from agent.core.config_utils import load_config
+    config = load_config(config_path)
 
     print(f"\nConfiguration loaded from {config_path}")
     print(f"Model: {model_name}")
@@ -25,7 +25,7 @@ cp agent/configs/agent_config.yaml "$OUTPUT_DIR/agent_config.yaml"
 
 # Generate trajectories
 echo "Generating trajectories..."
-python agent/training/generate_trajectories.py \
+python -m agent.training.generate_trajectories \
     --num-episodes "$NUM_EPISODES" \
     --model-name "$MODEL_NAME" \
     --config agent/configs/agent_config.yaml \
@@ -35,7 +35,7 @@ python agent/training/generate_trajectories.py \
 # Evaluate
 echo ""
 echo "Evaluating baseline..."
-python agent/training/evaluate.py \
+python -m agent.training.evaluate \
     --model-path "$MODEL_NAME" \
     --config agent/configs/eval_config.yaml \
     --num-episodes "$NUM_EPISODES" \
@@ -79,7 +79,7 @@ echo ""
 echo "=========================================="
 echo "Running Evaluation"
 echo "=========================================="
-python agent/training/evaluate.py \
+python -m agent.training.evaluate \
     --model-path "$MODEL_NAME" \
     --config agent/configs/eval_config.yaml \
     --num-episodes "$NUM_EPISODES" \
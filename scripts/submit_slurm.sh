@@ -81,7 +81,7 @@ case $MODE in
         MODEL_PATH=${2:-"Qwen/Qwen2.5-Coder-7B-Instruct"}
         NUM_EPISODES=${3:-10}
         echo "Running evaluation: $MODEL_PATH"
-        $RUNNER python agent/training/evaluate.py \
+        $RUNNER python -m agent.training.evaluate \
             --model-path "$MODEL_PATH" \
             --config agent/configs/eval_config.yaml \
             --num-episodes "$NUM_EPISODES" \
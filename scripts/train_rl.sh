@@ -39,7 +39,7 @@ echo ""
 
 # Train
 echo "Starting RL training..."
-python agent/training/train_rl.py \
+python -m agent.training.train_rl \
     --trajectories-dir "$TRAJECTORIES_DIR" \
     --config agent/configs/training_config.yaml \
     --output-dir "$OUTPUT_DIR" \
@@ -55,7 +55,7 @@ echo "Checkpoints saved to: $OUTPUT_DIR/checkpoints"
 echo "Logs saved to: $OUTPUT_DIR/training.log"
 echo ""
 echo "To evaluate the trained model:"
-echo "  python agent/training/evaluate.py \\"
+echo "  python -m agent.training.evaluate \\"
 echo "    --model-path $OUTPUT_DIR/checkpoints/final \\"
 echo "    --config agent/configs/eval_config.yaml"
 echo ""
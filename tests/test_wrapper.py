@@ -0,0 +1,140 @@
+"""
+Unit tests for the MLE-Dojo wrapper's code-extraction path.
+
+Run with: pytest tests/test_wrapper.py
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agent.core.base_agent import BaseAgent
+from agent.wrappers.mledojo_wrapper import MLEDojoWrapper, _batch_validate
+
+
+class DummyAgent(BaseAgent):
+    """Dummy agent for testing."""
+
+    def generate_response(self, observation, context=None):
+        return "dummy response"
+
+    def reset(self):
+        self.conversation_history = []
+
+
+@pytest.fixture
+def wrapper():
+    return MLEDojoWrapper(DummyAgent())
+
+
+class TestExtractCode:
+    """Test cases for MLEDojoWrapper._extract_code."""
+
+    def test_language_tagged_fence(self, wrapper):
+        """Code inside a ```python fence is extracted."""
+        response = "Here you go:\n```python\nx = 1\nprint(x)\n```\nDone."
+        assert wrapper._extract_code(response) == "x = 1\nprint(x)"
+
+    def test_plain_fence(self, wrapper):
+        """Code inside an untagged fence is extracted."""
+        response = "```\ny = 2\n```"
+        assert wrapper._extract_code(response) == "y = 2"
+
+    def test_tagged_block(self, wrapper):
+        """Code inside <code> tags is extracted."""
+        response = "Use this: <code>z = 3</code>"
+        assert wrapper._extract_code(response) == "z = 3"
+
+    def test_pure_code_response(self, wrapper):
+        """A response that is already plain code comes back whole."""
+        response = "import os\nprint(os.getcwd())"
+        assert wrapper._extract_code(response) == response
+
+    def test_fallback_line_scan(self, wrapper):
+        """Without fences, code lines are collected from prose."""
+        response = (
+            "I will solve it like this.\n"
+            "import pandas as pd\n"
+            "df = pd.DataFrame()\n"
+        )
+        code = wrapper._extract_code(response)
+        assert "import pandas as pd" in code
+        assert "df = pd.DataFrame()" in code
+        assert "I will" not in code
+
+    def test_prefers_tagged_over_plain(self, wrapper):
+        """Language-tagged fences win over plain fences."""
+        response = "```\nplain = 1\n```\n```python\ntagged = 2\n```"
+        assert wrapper._extract_code(response) == "tagged = 2"
+
+    def test_skips_invalid_candidate(self, wrapper):
+        """An unparseable first block falls through to the next one."""
+        response = "```python\ndef f(:\n```\n```python\nx = 1\n```"
+        assert wrapper._extract_code(response) == "x = 1"
+
+    def test_valid_candidate_survives_earlier_failure(self, wrapper):
+        """A block after an incomplete-suite block is returned intact.
+
+        The error line for "if True:" lands past the block's own lines;
+        the second block must neither be dropped nor routed through the
+        cleaning pass, which would strip prose-looking lines inside its
+        string literal.
+        """
+        response = (
+            "```python\nif True:\n```\n"
+            '```python\ns = """\nNote: keep me\n"""\nprint(s)\n```'
+        )
+        assert wrapper._extract_code(response) == 's = """\nNote: keep me\n"""\nprint(s)'
+
+    def test_cleaning_repairs_candidate(self, wrapper):
+        """Prose lines inside an otherwise-code fence are removed."""
+        response = "```python\nNote: this trains the model quickly!\ny = 2\n```"
+        assert wrapper._extract_code(response) == "y = 2"
+
+    def test_no_code_raises(self, wrapper):
+        """A response without extractable code raises ValueError."""
+        with pytest.raises(ValueError):
+            wrapper._extract_code("```python\n???\n```")
+
+
+class TestBatchValidate:
+    """Test cases for _batch_validate."""
+
+    def test_single_valid(self):
+        assert _batch_validate(["x = 1"]) == 0
+
+    def test_single_invalid(self):
+        assert _batch_validate(["def f(:"]) == -1
+
+    def test_first_of_many(self):
+        assert _batch_validate(["a = 1", "b = 2"]) == 0
+
+    def test_skips_invalid_prefix(self):
+        assert _batch_validate(["not ! valid ???", "y = 2"]) == 1
+
+    def test_all_invalid(self):
+        assert _batch_validate(["???", "!!!"]) == -1
+
+    def test_blame_reported_past_candidate(self):
+        """An incomplete suite blames the sentinel; the next candidate
+        must still be validated rather than discarded."""
+        assert _batch_validate(["if True:", "x = 1"]) == 1
+
+    def test_blame_chain(self):
+        assert _batch_validate(["if True:", "???", "y = 2"]) == 2
+
+    def test_splice_does_not_leak(self):
+        """An unclosed bracket absorbing the sentinel must not make an
+        invalid candidate look valid."""
+        assert _batch_validate(["x = (", ")"]) == -1
+
+    def test_valid_after_unclosed_bracket(self):
+        assert _batch_validate(["x = (", "z = 9"]) == 1
+
+
+# Run tests if executed directly
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])